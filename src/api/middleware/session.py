@@ -194,12 +194,10 @@ class SessionMiddleware(BaseHTTPMiddleware):
         try:
             auth_header = request.headers.get("Authorization")
             if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.replace("Bearer ", "")
+                token = auth_header[7:]
                 if token and len(token) > 20:
-                    from core.auth.supabase_auth import auth_manager
-                    from fastapi.security import HTTPAuthorizationCredentials
-                    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-                    user_info = await auth_manager.get_current_user(credentials)
+                    from core.auth.supabase_auth import get_auth_manager
+                    user_info = await get_auth_manager().authenticate(token)
                     user_id = user_info.get("user_id")
                     
                     # Get or create session
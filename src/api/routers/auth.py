@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr, Field, validator
 
-from core.auth.supabase_auth import auth_manager, get_current_user
+from core.auth.supabase_auth import get_auth_manager, get_current_user, security
 from api.schemas.common import SuccessResponse, ErrorResponse
 from api.middleware.session import session_manager
 from core.logging.setup import get_logger
@@ -21,7 +21,7 @@ async def auth_health_check():
     """Health check for authentication API"""
     try:
         # Test if auth manager is available
-        from core.auth.supabase_auth import auth_manager
+        get_auth_manager()
         return {
             "status": "healthy",
             "service": "authentication",
@@ -140,7 +140,7 @@ async def register_user(registration: UserRegistration):
         }
         
         # Register with Supabase
-        result = await auth_manager.register_user(
+        result = await get_auth_manager().register_user(
             email=registration.email,
             password=registration.password,
             user_metadata=user_metadata
@@ -172,7 +172,7 @@ async def login_user(login: UserLogin):
     try:
         logger.info(f"Login attempt for: {login.email}")
         
-        result = await auth_manager.login_user(
+        result = await get_auth_manager().login_user(
             email=login.email,
             password=login.password
         )
@@ -215,7 +215,7 @@ async def logout_user(request: Request, current_user: Dict[str, Any] = Depends(g
             token = auth_header.replace("Bearer ", "")
             
             # Invalidate the token on Supabase
-            result = await auth_manager.logout_user(token)
+            result = await get_auth_manager().logout_user(token)
             
             if result["success"]:
                 return SuccessResponse(
@@ -243,7 +243,7 @@ async def refresh_token(token_refresh: TokenRefresh):
     Refresh authentication token
     """
     try:
-        result = await auth_manager.refresh_token(token_refresh.refresh_token)
+        result = await get_auth_manager().refresh_token(token_refresh.refresh_token)
         
         if result["success"]:
             return AuthResponse(
@@ -267,7 +267,7 @@ async def verify_email(verification: EmailVerification):
     Verify user email with token
     """
     try:
-        result = await auth_manager.verify_email(verification.token)
+        result = await get_auth_manager().verify_email(verification.token)
         
         if result["success"]:
             return SuccessResponse(
@@ -289,7 +289,7 @@ async def reset_password(reset_request: PasswordReset):
     try:
         logger.info(f"Password reset requested for: {reset_request.email}")
         
-        result = await auth_manager.reset_password(reset_request.email)
+        result = await get_auth_manager().reset_password(reset_request.email)
         
         if result["success"]:
             return SuccessResponse(
@@ -309,7 +309,7 @@ async def update_password(password_update: PasswordUpdate):
     Update password with reset token
     """
     try:
-        result = await auth_manager.update_password(
+        result = await get_auth_manager().update_password(
             token=password_update.token,
             new_password=password_update.new_password
         )
@@ -327,16 +327,23 @@ async def update_password(password_update: PasswordUpdate):
 
 
 @router.get("/me", response_model=SuccessResponse)
-async def get_current_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_current_user_profile(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
     Get current user profile information
     """
     try:
+        # Email confirmation and account timestamps are not token claims
+        account = await get_auth_manager().get_account_details(credentials.credentials)
         return SuccessResponse(
-            data=current_user,
+            data={**current_user, **account},
             message="User profile retrieved successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get user profile failed: {str(e)}")
         raise HTTPException(status_code=400, detail="Failed to get user profile")
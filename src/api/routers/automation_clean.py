@@ -3,11 +3,12 @@ Clean Automation Router
 Simplified, readable automation endpoints using the new service architecture
 """
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from automation.manager import automation_manager
-from automation.constants import TaskPriority, TaskStatus
+from automation.constants import TaskPriority, TASK_PRIORITY_BY_VALUE, TASK_STATUS_BY_VALUE
 from core.auth.supabase_auth import get_current_user
 from api.schemas.common import SuccessResponse
 from core.logging.setup import get_logger
@@ -73,13 +74,7 @@ async def start_scraping(
             )
         
         # Convert priority string to enum
-        priority_map = {
-            "low": TaskPriority.LOW,
-            "medium": TaskPriority.MEDIUM, 
-            "high": TaskPriority.HIGH,
-            "urgent": TaskPriority.URGENT
-        }
-        priority = priority_map.get(request.priority.lower(), TaskPriority.HIGH)
+        priority = TASK_PRIORITY_BY_VALUE.get(request.priority.lower(), TaskPriority.HIGH)
         
         # Prepare configuration
         config = {
@@ -188,24 +183,27 @@ async def cancel_session(
 async def list_sessions(
     source: Optional[str] = None,
     status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    List scraping sessions for the current user
+    List scraping sessions for the current user, newest first
     """
     try:
         # Convert status string to enum if provided
         status_filter = None
         if status:
-            try:
-                status_filter = TaskStatus(status.lower())
-            except ValueError:
+            status_filter = TASK_STATUS_BY_VALUE.get(status.lower())
+            if status_filter is None:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
         sessions = automation_manager.list_sessions(
             user_id=current_user["user_id"],
             source=source,
-            status=status_filter
+            status=status_filter,
+            limit=limit,
+            offset=offset
         )
         
         return SuccessResponse(
@@ -234,13 +232,7 @@ async def start_all_scrapers(
     """
     try:
         # Convert priority
-        priority_map = {
-            "low": TaskPriority.LOW,
-            "medium": TaskPriority.MEDIUM,
-            "high": TaskPriority.HIGH,
-            "urgent": TaskPriority.URGENT
-        }
-        task_priority = priority_map.get(priority.lower(), TaskPriority.HIGH)
+        task_priority = TASK_PRIORITY_BY_VALUE.get(priority.lower(), TaskPriority.HIGH)
         
         # Configuration for all scrapers
         config = {
@@ -325,6 +317,24 @@ async def get_system_metrics(
         raise HTTPException(status_code=500, detail=f"Failed to get metrics: {str(e)}")
 
 
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Get health metrics in Prometheus text exposition format
+    """
+    try:
+        return PlainTextResponse(
+            automation_manager.get_prometheus_metrics(),
+            media_type="text/plain; version=0.0.4"
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to get Prometheus metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get Prometheus metrics: {str(e)}")
+
+
 @router.get("/performance", response_model=SuccessResponse)
 async def get_performance_report(
     current_user: Dict[str, Any] = Depends(get_current_user)
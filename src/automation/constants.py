@@ -24,12 +24,40 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
 
 
+# Enum members keyed by value, for converting strings without going through the Enum constructor
+TASK_STATUS_BY_VALUE: Dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+TASK_PRIORITY_BY_VALUE: Dict[str, TaskPriority] = {priority.value: priority for priority in TaskPriority}
+
+
+# Statuses after which a task or session no longer changes on its own
+TERMINAL_TASK_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+
+
+# Dispatch order for queued tasks (lower runs first)
+TASK_PRIORITY_RANK: Dict[TaskPriority, int] = {
+    TaskPriority.URGENT: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.LOW: 3,
+}
+
+
 class ScraperSource(str, Enum):
     """Available scraper sources"""
     UNGM = "ungm"
     TUNIPAGES = "tunipages"
 
 
+SCRAPER_SOURCE_BY_VALUE: Dict[str, ScraperSource] = {source.value: source for source in ScraperSource}
+
+
+# Scraper entry points, keyed by source (module path + function name)
+SCRAPER_FUNCTIONS: Dict[str, str] = {
+    ScraperSource.UNGM.value: 'automation.scrapers.ungm_playwright_scraper.run_ungm_scraping',
+    ScraperSource.TUNIPAGES.value: 'automation.scrapers.tunipages_scraper.run_tunipages_scraping',
+}
+
+
 class AutomationDefaults:
     """Default configuration values for automation"""
     
@@ -55,10 +83,16 @@ class AutomationDefaults:
     CLEANUP_HOURS = 24
     CLEANUP_FAILED_HOURS = 72
     
+    # Persistence
+    SESSION_DB_FILENAME = "automation_sessions.db"
+    SESSION_ARCHIVE_DAYS = 30
+    
     # Monitoring
     METRICS_RETENTION_DAYS = 30
     ALERT_FAILURE_THRESHOLD = 0.5
     HEALTH_CHECK_INTERVAL = 60
+    EXECUTION_TIME_SAMPLES = 1024  # Recent execution times kept for percentiles
+    PROMETHEUS_CACHE_TTL = 15  # seconds
 
 
 class ErrorCodes:
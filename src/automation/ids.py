@@ -0,0 +1,16 @@
+"""
+Automation Identifier Generation
+Cheap, process-unique ids for tasks and sessions
+"""
+import itertools
+import secrets
+
+# Random per-process prefix keeps ids from different workers apart; the
+# counter keeps them unique within this process without a urandom read per id
+_PROCESS_NONCE = secrets.token_hex(4)
+_COUNTER = itertools.count()
+
+
+def generate_id(prefix: str) -> str:
+    """Generate a unique id such as ``task_1a2b3c4d_0000002a``"""
+    return f"{prefix}_{_PROCESS_NONCE}_{next(_COUNTER):08x}"
@@ -9,7 +9,8 @@ from datetime import datetime
 
 from .constants import TaskPriority, TaskStatus, AutomationDefaults
 from .types import AutomationMetrics, HealthStatus
-from .services import TaskService, ScraperService, SessionService, HealthService
+from .services import TaskService, ScraperService, SessionService, SessionStore, HealthService
+from core.config.settings import settings
 from core.logging.setup import get_logger
 
 logger = get_logger("automation_manager")
@@ -30,7 +31,13 @@ class AutomationManager:
         # Initialize services
         self.task_service = TaskService(max_workers)
         self.scraper_service = ScraperService()
-        self.session_service = SessionService(self.task_service, self.scraper_service)
+        self.session_store = (
+            SessionStore(settings.data_dir / AutomationDefaults.SESSION_DB_FILENAME)
+            if settings.automation.session_persistence_enabled else None
+        )
+        self.session_service = SessionService(
+            self.task_service, self.scraper_service, self.session_store
+        )
         self.health_service = HealthService(self.task_service, self.session_service)
         
         # Background scheduler
@@ -62,7 +69,7 @@ class AutomationManager:
         Returns:
             Session ID if successful, None if failed
         """
-        logger.info(f"Starting scraping session for {source} (user: {user_id})")
+        logger.info("Starting scraping session for %s (user: %s)", source, user_id)
         
         # Create session
         session_id = self.session_service.create_scraping_session(
@@ -74,16 +81,16 @@ class AutomationManager:
         )
         
         if not session_id:
-            logger.error(f"Failed to create scraping session for {source}")
+            logger.error("Failed to create scraping session for %s", source)
             return None
         
         # Start the session
         success = self.session_service.start_session(session_id)
         if success:
-            logger.info(f"Scraping session {session_id} started successfully")
+            logger.info("Scraping session %s started successfully", session_id)
             return session_id
         else:
-            logger.error(f"Failed to start scraping session {session_id}")
+            logger.error("Failed to start scraping session %s", session_id)
             return None
     
     def get_session_status(self, session_id: str) -> Dict[str, Any]:
@@ -98,10 +105,12 @@ class AutomationManager:
         self,
         user_id: Optional[str] = None,
         source: Optional[str] = None,
-        status: Optional[TaskStatus] = None
+        status: Optional[TaskStatus] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """List scraping sessions with optional filters"""
-        return self.session_service.list_sessions(user_id, source, status)
+        """List scraping sessions with optional filters, newest first"""
+        return self.session_service.list_sessions(user_id, source, status, limit, offset)
     
     def start_all_scrapers(self, config: Optional[Dict[str, Any]] = None) -> List[str]:
         """Start scraping sessions for all available scrapers"""
@@ -117,7 +126,7 @@ class AutomationManager:
             if session_id:
                 session_ids.append(session_id)
         
-        logger.info(f"Started {len(session_ids)} scraping sessions")
+        logger.info("Started %s scraping sessions", len(session_ids))
         return session_ids
     
     # === System Management ===
@@ -138,6 +147,10 @@ class AutomationManager:
         """Get performance analysis report"""
         return self.health_service.get_performance_report()
     
+    def get_prometheus_metrics(self) -> str:
+        """Get health metrics in Prometheus text exposition format"""
+        return self.health_service.get_prometheus_metrics()
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get comprehensive system metrics"""
         task_metrics = self.task_service.get_metrics()
@@ -233,7 +246,7 @@ class AutomationManager:
             'total_cleaned': tasks_cleaned + sessions_cleaned
         }
         
-        logger.info(f"Cleanup completed: {cleanup_result}")
+        logger.info("Cleanup completed: %s", cleanup_result)
         return cleanup_result
     
     # === Lifecycle Management ===
@@ -253,6 +266,9 @@ class AutomationManager:
         # Shutdown task service
         self.task_service.shutdown()
         
+        if self.session_store:
+            self.session_store.close()
+        
         logger.info("Automation Manager shutdown complete")
     
     def restart_services(self) -> bool:
@@ -273,7 +289,7 @@ class AutomationManager:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to restart services: {str(e)}")
+            logger.error("Failed to restart services: %s", e)
             return False
     
     # === Private Methods ===
@@ -287,7 +303,7 @@ class AutomationManager:
                 # Perform health check
                 health = self.health_service.check_system_health()
                 if not health.is_healthy():
-                    logger.warning(f"System health degraded: {health.issues}")
+                    logger.warning("System health degraded: %s", health.issues)
                 
                 # Cleanup old data periodically (every hour)
                 current_time = time.time()
@@ -299,7 +315,7 @@ class AutomationManager:
                 time.sleep(AutomationDefaults.SCHEDULER_INTERVAL)
                 
             except Exception as e:
-                logger.error(f"Scheduler error: {str(e)}")
+                logger.error("Scheduler error: %s", e)
                 time.sleep(60)  # Wait longer on error
         
         logger.info("Scheduler loop stopped")
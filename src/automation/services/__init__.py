@@ -5,12 +5,14 @@ Business logic layer for automation operations
 
 from .task_service import TaskService
 from .scraper_service import ScraperService  
+from .session_store import SessionStore
 from .session_service import SessionService
 from .health_service import HealthService
 
 __all__ = [
     'TaskService',
     'ScraperService', 
+    'SessionStore',
     'SessionService',
     'HealthService'
 ]
\ No newline at end of file
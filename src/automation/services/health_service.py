@@ -2,8 +2,16 @@
 Health Service  
 Monitors automation system health and performance
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from concurrent.futures import Future
+import threading
+import time
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
 
 from ..constants import HealthCheckThresholds, AutomationDefaults
 from ..types import HealthStatus, AutomationMetrics
@@ -21,10 +29,43 @@ class HealthService:
         self.task_service = task_service
         self.session_service = session_service
         self.last_health_check = None
+        self.last_check_duration: Optional[float] = None
+        
+        # Rendered Prometheus exposition, reused until it expires
+        self._prometheus_cache: Optional[str] = None
+        self._prometheus_cache_time = 0.0
+        
+        # Concurrent callers share the result of a health check already in flight
+        self._lock = threading.Lock()
+        self._inflight_check: Optional[Future] = None
     
     def check_system_health(self) -> HealthStatus:
         """Perform comprehensive health check"""
+        with self._lock:
+            inflight = self._inflight_check
+            is_leader = inflight is None
+            if is_leader:
+                inflight = self._inflight_check = Future()
+        
+        if not is_leader:
+            logger.debug("Joining health check already in progress")
+            return inflight.result()
+        
+        try:
+            health_status = self._run_health_check()
+            inflight.set_result(health_status)
+            return health_status
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight_check = None
+    
+    def _run_health_check(self) -> HealthStatus:
+        """Run all health checks and determine the overall status"""
         logger.debug("Performing system health check")
+        check_started = time.perf_counter()
         
         health_status = HealthStatus(status="healthy")
         
@@ -42,7 +83,7 @@ class HealthService:
         
         # Determine overall status
         total_tasks = health_status.metrics.total_tasks if health_status.metrics else 0
-        session_metrics = self.session_service.get_session_metrics()
+        session_metrics = health_status.session_metrics or {}
         total_sessions = session_metrics.get('total_sessions', 0)
         
         if len(health_status.issues) == 0:
@@ -55,9 +96,11 @@ class HealthService:
         else:
             health_status.status = "unhealthy"
         
-        self.last_health_check = datetime.now()
+        with self._lock:
+            self.last_health_check = datetime.now()
+            self.last_check_duration = time.perf_counter() - check_started
         
-        logger.info(f"Health check completed: {health_status.status} ({len(health_status.issues)} issues)")
+        logger.info("Health check completed: %s (%d issues)", health_status.status, len(health_status.issues))
         return health_status
     
     def get_health_summary(self) -> Dict[str, Any]:
@@ -74,6 +117,47 @@ class HealthService:
             'metrics': health_status.metrics.to_dict() if health_status.metrics else None
         }
     
+    def get_prometheus_metrics(self) -> str:
+        """Get health metrics in Prometheus text exposition format"""
+        with self._lock:
+            cached = self._prometheus_cache
+            if (cached is not None and
+                    time.monotonic() - self._prometheus_cache_time < AutomationDefaults.PROMETHEUS_CACHE_TTL):
+                return cached
+        
+        health_status = self.check_system_health()
+        metrics = health_status.metrics or AutomationMetrics()
+        session_metrics = health_status.session_metrics or {}
+        
+        lines = [
+            "# HELP automation_health_status Current automation health status (1 for the active status)",
+            "# TYPE automation_health_status gauge",
+        ]
+        lines.extend(
+            f'automation_health_status{{status="{status}"}} {int(health_status.status == status)}'
+            for status in ("healthy", "idle", "degraded", "unhealthy")
+        )
+        lines.extend([
+            "# HELP automation_active_tasks Number of tasks currently running",
+            "# TYPE automation_active_tasks gauge",
+            f"automation_active_tasks {metrics.active_tasks}",
+            "# HELP automation_failure_rate Ratio of failed tasks to finished tasks",
+            "# TYPE automation_failure_rate gauge",
+            f"automation_failure_rate {metrics.failure_rate()}",
+            "# HELP automation_session_success_rate Ratio of processed to found tenders across sessions",
+            "# TYPE automation_session_success_rate gauge",
+            f"automation_session_success_rate {session_metrics.get('overall_success_rate', 0.0)}",
+            "# HELP automation_health_check_latency_seconds Duration of the last health check",
+            "# TYPE automation_health_check_latency_seconds gauge",
+            f"automation_health_check_latency_seconds {self.last_check_duration or 0.0}",
+        ])
+        
+        rendered = "\n".join(lines) + "\n"
+        with self._lock:
+            self._prometheus_cache = rendered
+            self._prometheus_cache_time = time.monotonic()
+        return rendered
+    
     def _check_task_service_health(self, health_status: HealthStatus) -> None:
         """Check task service health"""
         try:
@@ -120,6 +204,7 @@ class HealthService:
         """Check session service health"""
         try:
             session_metrics = self.session_service.get_session_metrics()
+            health_status.session_metrics = session_metrics
             
             # Check if sessions are being created (informational, not critical)
             total_sessions = session_metrics.get('total_sessions', 0)
@@ -147,9 +232,13 @@ class HealthService:
     
     def _check_resource_health(self, health_status: HealthStatus) -> None:
         """Check system resource usage"""
+        if not HAS_PSUTIL:
+            # psutil not available, skip resource checks
+            health_status.checks['resource_monitoring'] = False
+            logger.debug("psutil not available, skipping resource checks")
+            return
+        
         try:
-            import psutil
-            
             # Check memory usage
             memory = psutil.virtual_memory()
             memory_mb = memory.used / (1024 * 1024)
@@ -168,10 +257,6 @@ class HealthService:
                 
             health_status.checks['resource_monitoring'] = True
             
-        except ImportError:
-            # psutil not available, skip resource checks
-            health_status.checks['resource_monitoring'] = False
-            logger.debug("psutil not available, skipping resource checks")
         except Exception as e:
             health_status.add_issue(f"Resource health check failed: {str(e)}")
             health_status.checks['resource_monitoring'] = False
@@ -202,8 +287,15 @@ class HealthService:
     def get_system_status(self) -> Dict[str, Any]:
         """Get detailed system status"""
         health = self.check_system_health()
-        task_metrics = self.task_service.get_metrics()
-        session_metrics = self.session_service.get_session_metrics()
+        
+        # Reuse the metrics gathered by the health check; only query the
+        # services again if that check failed before collecting them
+        task_metrics = health.metrics or self.task_service.get_metrics()
+        session_metrics = (
+            health.session_metrics
+            if health.session_metrics is not None
+            else self.session_service.get_session_metrics()
+        )
         
         return {
             'overall_health': health.status,
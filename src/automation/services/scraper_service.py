@@ -6,13 +6,15 @@ from typing import Dict, Optional, Any, List, Callable
 import importlib
 from pathlib import Path
 
-from ..constants import ScraperSource, AutomationDefaults, ErrorCodes, AutomationMessages
+from ..constants import ScraperSource, AutomationDefaults, ErrorCodes, AutomationMessages, SCRAPER_FUNCTIONS
 from ..types import ScrapingResult, ConfigDict
 from core.logging.setup import get_logger
 from core.config.manager import config_manager
 
 logger = get_logger("scraper_service")
 
+_REQUIRED_CONFIG_FIELDS = frozenset({'max_pages', 'timeout', 'headless'})
+
 
 class ScraperService:
     """Service for managing scrapers"""
@@ -23,21 +25,16 @@ class ScraperService:
         self.load_scrapers()
     
     def load_scrapers(self) -> None:
-        """Load all available scrapers with graceful fallback"""
+        """Load all available scrapers"""
         logger.info("Loading scrapers...")
         
-        # Try to load enhanced scrapers first
-        enhanced_loaded = self._load_enhanced_scrapers()
-        
-        # Fallback to basic scrapers if enhanced not available
-        if not enhanced_loaded:
-            self._load_basic_scrapers()
+        self._load_all_scrapers()
         
-        # Load individual scrapers as last resort
         if not self.scrapers:
-            self._load_individual_scrapers()
+            logger.warning("No scrapers available")
+            return
         
-        logger.info(f"Loaded {len(self.scrapers)} scrapers: {list(self.scrapers.keys())}")
+        logger.info("Loaded %d scrapers: %s", len(self.scrapers), ", ".join(self.scrapers))
     
     def get_available_scrapers(self) -> List[str]:
         """Get list of available scraper sources"""
@@ -60,25 +57,24 @@ class ScraperService:
                 overrides={}
             )
         except Exception as e:
-            logger.warning(f"Failed to get config for {source}: {e}")
+            logger.warning("Failed to get config for %s: %s", source, e)
             return self._get_default_config(source)
     
     def validate_scraper_config(self, source: str, config: Dict[str, Any]) -> bool:
         """Validate scraper configuration"""
-        required_fields = ['max_pages', 'timeout', 'headless']
-        
-        for field in required_fields:
-            if field not in config:
-                logger.error(f"Missing required config field '{field}' for {source}")
-                return False
+        missing_fields = _REQUIRED_CONFIG_FIELDS.difference(config)
+        if missing_fields:
+            logger.error("Missing required config fields %s for %s", sorted(missing_fields), source)
+            return False
         
         # Validate value ranges
-        if config.get('max_pages', 0) <= 0:
-            logger.error(f"Invalid max_pages value for {source}")
+        max_pages, timeout = config['max_pages'], config['timeout']
+        if max_pages <= 0:
+            logger.error("Invalid max_pages value for %s", source)
             return False
         
-        if config.get('timeout', 0) <= 0:
-            logger.error(f"Invalid timeout value for {source}")
+        if timeout <= 0:
+            logger.error("Invalid timeout value for %s", source)
             return False
         
         return True
@@ -109,81 +105,16 @@ class ScraperService:
         
         return complete_config
     
-    def _load_enhanced_scrapers(self) -> bool:
-        """Try to load enhanced scrapers"""
-        try:
-            enhanced_scrapers = {
-                'ungm': 'automation.scrapers.ungm_playwright_scraper.run_ungm_scraping',
-                'tunipages': 'automation.scrapers.tunipages_scraper.run_tunipages_scraping'
-            }
-            
-            loaded_count = 0
-            for source, module_path in enhanced_scrapers.items():
-                try:
-                    scraper_func = self._import_scraper_function(module_path)
-                    if scraper_func:
-                        self.scrapers[source] = scraper_func
-                        loaded_count += 1
-                        logger.info(f"✅ Loaded Enhanced {source.upper()} scraper")
-                except ImportError as e:
-                    logger.warning(f"Enhanced {source} scraper not available: {e}")
-            
-            if loaded_count > 0:
-                logger.info(f"✅ Loaded {loaded_count} ENHANCED scrapers")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.warning(f"Failed to load enhanced scrapers: {e}")
-            return False
-    
-    def _load_basic_scrapers(self) -> bool:
-        """Load basic scrapers as fallback"""
-        try:
-            basic_scrapers = {
-                'ungm': 'automation.scrapers.ungm_playwright_scraper.run_ungm_scraping',
-                'tunipages': 'automation.scrapers.tunipages_scraper.run_tunipages_scraping'
-            }
-            
-            loaded_count = 0
-            for source, module_path in basic_scrapers.items():
-                try:
-                    scraper_func = self._import_scraper_function(module_path)
-                    if scraper_func:
-                        self.scrapers[source] = scraper_func
-                        loaded_count += 1
-                        logger.info(f"⚠️ Loaded Basic {source.upper()} scraper")
-                except ImportError as e:
-                    logger.warning(f"Basic {source} scraper not available: {e}")
-            
-            if loaded_count > 0:
-                logger.info(f"⚠️ Loaded {loaded_count} BASIC scrapers")
-                return True
+    def _load_all_scrapers(self) -> None:
+        """Import every registered scraper function in a single pass"""
+        for source, module_path in SCRAPER_FUNCTIONS.items():
+            scraper_func = self._import_scraper_function(module_path)
+            if scraper_func is None:
+                logger.warning("[WARN] %s scraper not available", source)
+                continue
             
-            return False
-            
-        except Exception as e:
-            logger.warning(f"Failed to load basic scrapers: {e}")
-            return False
-    
-    def _load_individual_scrapers(self) -> None:
-        """Load individual scrapers as last resort"""
-        scrapers_to_try = [
-            ('ungm', 'automation.scrapers.ungm_playwright_scraper.run_ungm_scraping'),
-            ('tunipages', 'automation.scrapers.tunipages_scraper.run_tunipages_scraping')
-        ]
-        
-        for source, module_path in scrapers_to_try:
-            if source not in self.scrapers:  # Only load if not already loaded
-                try:
-                    scraper_func = self._import_scraper_function(module_path)
-                    if scraper_func:
-                        self.scrapers[source] = scraper_func
-                        scraper_type = "Enhanced" if "enhanced" in module_path else "Basic"
-                        logger.info(f"📦 Loaded {scraper_type} {source.upper()} scraper individually")
-                except ImportError:
-                    continue
+            self.scrapers[source] = scraper_func
+            logger.info("[OK] Loaded %s scraper", source.upper())
     
     def _import_scraper_function(self, module_path: str) -> Optional[Callable]:
         """Import a scraper function from module path"""
@@ -192,7 +123,7 @@ class ScraperService:
             module = importlib.import_module(module_name)
             return getattr(module, function_name)
         except (ImportError, AttributeError) as e:
-            logger.debug(f"Failed to import {module_path}: {e}")
+            logger.debug("Failed to import %s: %s", module_path, e)
             return None
     
     def _get_default_config(self, source: str) -> Dict[str, Any]:
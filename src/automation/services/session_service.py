@@ -2,14 +2,20 @@
 Session Service
 Handles scraping session management and tracking
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
+from collections import defaultdict
 from datetime import datetime
-import uuid
+import heapq
+import threading
 
-from ..constants import TaskStatus, TaskPriority, ScraperSource
-from ..types import ScrapingSession, AutomationTask, ConfigDict
+from ..constants import (
+    TaskStatus, TaskPriority, AutomationDefaults, SCRAPER_SOURCE_BY_VALUE, TERMINAL_TASK_STATUSES
+)
+from ..types import ScrapingSession, AutomationTask, TaskResult, ConfigDict
+from ..ids import generate_id
 from .task_service import TaskService
 from .scraper_service import ScraperService
+from .session_store import SessionStore
 from core.logging.setup import get_logger
 
 logger = get_logger("session_service")
@@ -18,11 +24,38 @@ logger = get_logger("session_service")
 class SessionService:
     """Service for managing scraping sessions"""
     
-    def __init__(self, task_service: TaskService, scraper_service: ScraperService):
+    def __init__(
+        self,
+        task_service: TaskService,
+        scraper_service: ScraperService,
+        session_store: Optional[SessionStore] = None
+    ):
         self.task_service = task_service
         self.scraper_service = scraper_service
+        self.session_store = session_store
         self.sessions: Dict[str, ScrapingSession] = {}
         self.task_to_session: Dict[str, str] = {}  # Map task_id to session_id
+        
+        # Secondary indexes of session ids for filtered listing. Writers hold the
+        # lock; readers use GIL-atomic snapshots (list()/len()/get()) and never lock.
+        self._sessions_by_user: Dict[Optional[str], Set[str]] = defaultdict(set)
+        self._sessions_by_source: Dict[str, Set[str]] = defaultdict(set)
+        self._sessions_by_status: Dict[TaskStatus, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+        
+        # Running tender totals across all tracked sessions
+        self._total_tenders_found = 0
+        self._total_tenders_processed = 0
+        
+        # Heap of finished sessions keyed on end time, for cleanup without a full scan.
+        # End times come from task results and are observed out of order, so a FIFO would not do.
+        # _finished_at holds each session's current end time so stale entries are skipped.
+        self._finished_heap: List[Tuple[datetime, str]] = []
+        self._finished_at: Dict[str, datetime] = {}
+        
+        # Status responses for finished sessions, dropped when their task changes state
+        self._status_cache: Dict[str, Dict[str, Any]] = {}
+        self.task_service.add_state_listener(self._on_task_state_change)
     
     def create_scraping_session(
         self,
@@ -36,21 +69,25 @@ class SessionService:
         
         # Validate scraper availability
         if not self.scraper_service.is_scraper_available(source):
-            logger.error(f"Scraper source '{source}' is not available")
+            logger.error("Scraper source '%s' is not available", source)
             return None
         
         # Create session
-        session_id = f"{source}_{uuid.uuid4().hex[:12]}"
+        session_id = generate_id(source)
         
         session = ScrapingSession(
             session_id=session_id,
-            source=ScraperSource(source),
+            source=SCRAPER_SOURCE_BY_VALUE[source],
             user_id=user_id,
             config=config or {},
             status=TaskStatus.PENDING
         )
         
-        self.sessions[session_id] = session
+        with self._lock:
+            self.sessions[session_id] = session
+            self._sessions_by_user[session.user_id].add(session_id)
+            self._sessions_by_source[session.source.value].add(session_id)
+            self._sessions_by_status[session.status].add(session_id)
         
         # Get scraper function and create task config
         scraper_function = self.scraper_service.get_scraper_function(source)
@@ -72,32 +109,33 @@ class SessionService:
         )
         
         # Link task to session
-        self.task_to_session[task_id] = session_id
-        session.metadata['task_id'] = task_id
+        with self._lock:
+            self.task_to_session[task_id] = session_id
+            session.metadata['task_id'] = task_id
         
-        logger.info(f"Created scraping session {session_id} for {source} (task: {task_id})")
+        logger.info("Created scraping session %s for %s (task: %s)", session_id, source, task_id)
         return session_id
     
     def start_session(self, session_id: str) -> bool:
         """Start a scraping session"""
         session = self.sessions.get(session_id)
         if not session:
-            logger.error(f"Session {session_id} not found")
+            logger.error("Session %s not found", session_id)
             return False
         
         task_id = session.metadata.get('task_id')
         if not task_id:
-            logger.error(f"No task associated with session {session_id}")
+            logger.error("No task associated with session %s", session_id)
             return False
         
         # Submit task for execution
         success = self.task_service.submit_task(task_id)
         if success:
-            session.status = TaskStatus.RUNNING
             session.start_time = datetime.now()
-            logger.info(f"Started scraping session {session_id}")
+            self._set_status(session, TaskStatus.RUNNING)
+            logger.info("Started scraping session %s", session_id)
         else:
-            logger.error(f"Failed to start task for session {session_id}")
+            logger.error("Failed to start task for session %s", session_id)
         
         return success
     
@@ -105,7 +143,20 @@ class SessionService:
         """Get detailed status of a scraping session"""
         session = self.sessions.get(session_id)
         if not session:
-            return {'error': f'Session {session_id} not found'}
+            # Sessions removed by cleanup are still served from the store
+            stored = self.session_store.load(session_id) if self.session_store else None
+            if stored is None:
+                return {'error': f'Session {session_id} not found'}
+            
+            archived, task = stored
+            session_status = self._build_status(archived, archived.metadata.get('task_id'), None, None, None)
+            # The task object is not archived, so task_info stays None; its outcome was
+            session_status.update(task)
+            return session_status
+        
+        cached_status = self._status_cache.get(session_id)
+        if cached_status is not None:
+            return dict(cached_status)
         
         task_id = session.metadata.get('task_id')
         task_status = None
@@ -119,23 +170,46 @@ class SessionService:
             
             # Update session status based on task status
             if task_status and task_status != session.status:
-                session.status = task_status
+                # Prefer the task's own completion time over reading the clock again
+                finished_at = task_result.completed_at if task_result else None
                 
                 if task_status == TaskStatus.COMPLETED and task_result:
-                    session.end_time = datetime.now()
+                    session.end_time = finished_at or datetime.now()
                     # Extract metrics from task result if available
                     if isinstance(task_result.result, dict):
                         result_data = task_result.result
-                        session.tenders_found = result_data.get('tenders_found', 0)
-                        session.tenders_processed = result_data.get('tenders_processed', 0)
+                        self._set_tender_counts(
+                            session,
+                            result_data.get('tenders_found', 0),
+                            result_data.get('tenders_processed', 0)
+                        )
                         session.pages_processed = result_data.get('pages_processed', 0)
                 
                 elif task_status == TaskStatus.FAILED and task_result:
-                    session.end_time = datetime.now()
+                    session.end_time = finished_at or datetime.now()
                     session.error_message = task_result.error
+                
+                self._set_status(session, task_status)
+        
+        session_status = self._build_status(session, task_id, task_status, task_result, task_info)
+        
+        # Finished sessions no longer change until their task does
+        if session.status in TERMINAL_TASK_STATUSES:
+            self._status_cache[session_id] = session_status
         
+        return dict(session_status)
+    
+    def _build_status(
+        self,
+        session: ScrapingSession,
+        task_id: Optional[str],
+        task_status: Optional[TaskStatus],
+        task_result: Optional[TaskResult],
+        task_info: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Assemble the status response for a session"""
         return {
-            'session_id': session_id,
+            'session_id': session.session_id,
             'status': session.status.value if session.status else None,
             'source': session.source.value,
             'user_id': session.user_id,
@@ -160,16 +234,16 @@ class SessionService:
         """Cancel a scraping session"""
         session = self.sessions.get(session_id)
         if not session:
-            logger.error(f"Session {session_id} not found")
+            logger.error("Session %s not found", session_id)
             return False
         
         task_id = session.metadata.get('task_id')
         if task_id:
             success = self.task_service.cancel_task(task_id)
             if success:
-                session.status = TaskStatus.CANCELLED
                 session.end_time = datetime.now()
-                logger.info(f"Cancelled scraping session {session_id}")
+                self._set_status(session, TaskStatus.CANCELLED)
+                logger.info("Cancelled scraping session %s", session_id)
                 return True
         
         return False
@@ -178,20 +252,43 @@ class SessionService:
         self, 
         user_id: Optional[str] = None,
         source: Optional[str] = None,
-        status: Optional[TaskStatus] = None
+        status: Optional[TaskStatus] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """List scraping sessions with optional filters"""
-        sessions = []
+        """List scraping sessions with optional filters, newest first"""
+        # Intersect the index buckets for the requested filters, smallest first
+        candidate_sets = []
+        if user_id:
+            candidate_sets.append(self._sessions_by_user.get(user_id, set()))
+        if source:
+            candidate_sets.append(self._sessions_by_source.get(source, set()))
+        if status:
+            candidate_sets.append(self._sessions_by_status.get(status, set()))
         
-        for session_id, session in self.sessions.items():
-            # Apply filters
-            if user_id and session.user_id != user_id:
-                continue
-            if source and session.source.value != source:
-                continue
-            if status and session.status != status:
-                continue
-            
+        end = offset + limit if limit is not None else None
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            session_ids = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            matched = [
+                (session_id, session)
+                for session_id, session in zip(session_ids, map(self.sessions.get, session_ids))
+                if session is not None
+            ]
+            if end is None:
+                matched.sort(key=lambda item: item[1].created_at, reverse=True)
+            else:
+                matched = heapq.nlargest(end, matched, key=lambda item: item[1].created_at)
+            matched = matched[offset:end]
+        else:
+            # Sessions are inserted as they are created, so dict order is creation order
+            items = list(self.sessions.items())
+            stop = len(items) - offset
+            start = max(stop - limit, 0) if limit is not None else 0
+            matched = items[start:max(stop, 0)][::-1]
+        
+        sessions = []
+        for session_id, session in matched:
             # Get basic session info
             session_info = {
                 'session_id': session_id,
@@ -209,31 +306,60 @@ class SessionService:
             
             sessions.append(session_info)
         
-        # Sort by creation time (newest first)
-        sessions.sort(key=lambda s: s['created_at'], reverse=True)
         return sessions
     
+    def _on_task_state_change(self, task_id: str) -> None:
+        """Invalidate the cached status of the session owning a task"""
+        session_id = self.task_to_session.get(task_id)
+        if session_id:
+            self._status_cache.pop(session_id, None)
+    
+    def _set_status(self, session: ScrapingSession, status: TaskStatus) -> None:
+        """Change a session's status and move it to the matching index bucket"""
+        with self._lock:
+            self._sessions_by_status[session.status].discard(session.session_id)
+            session.status = status
+            self._sessions_by_status[status].add(session.session_id)
+            self._status_cache.pop(session.session_id, None)
+            
+            if status in TERMINAL_TASK_STATUSES and session.end_time:
+                self._finished_at[session.session_id] = session.end_time
+                heapq.heappush(self._finished_heap, (session.end_time, session.session_id))
+            else:
+                self._finished_at.pop(session.session_id, None)
+        
+        # Archived once finished, outside the lock so status reads are not held up by the write
+        if self.session_store and status in TERMINAL_TASK_STATUSES:
+            task_id = session.metadata.get('task_id')
+            self.session_store.save(
+                session,
+                self.task_service.get_task_status(task_id) if task_id else None,
+                self.task_service.get_task_result(task_id) if task_id else None
+            )
+    
+    def _set_tender_counts(self, session: ScrapingSession, found: int, processed: int) -> None:
+        """Update a session's tender counts and the running totals"""
+        with self._lock:
+            self._total_tenders_found += found - session.tenders_found
+            self._total_tenders_processed += processed - session.tenders_processed
+            session.tenders_found = found
+            session.tenders_processed = processed
+    
     def get_session_metrics(self) -> Dict[str, Any]:
         """Get session-related metrics"""
+        status_counts = {
+            status.value: len(session_ids)
+            for status, session_ids in list(self._sessions_by_status.items())
+            if session_ids
+        }
+        source_counts = {
+            source: len(session_ids)
+            for source, session_ids in list(self._sessions_by_source.items())
+            if session_ids
+        }
         total_sessions = len(self.sessions)
-        
-        status_counts = {}
-        source_counts = {}
-        total_tenders_found = 0
-        total_tenders_processed = 0
-        
-        for session in self.sessions.values():
-            # Count by status
-            status = session.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-            
-            # Count by source
-            source = session.source.value
-            source_counts[source] = source_counts.get(source, 0) + 1
-            
-            # Sum tender counts
-            total_tenders_found += session.tenders_found
-            total_tenders_processed += session.tenders_processed
+        total_tenders_found = self._total_tenders_found
+        total_tenders_processed = self._total_tenders_processed
         
         return {
             'total_sessions': total_sessions,
@@ -247,25 +373,45 @@ class SessionService:
             )
         }
     
-    def cleanup_old_sessions(self, hours_old: int = 72) -> int:
-        """Clean up old completed sessions"""
+    def cleanup_old_sessions(
+        self,
+        hours_old: int = 72,
+        archive_days: int = AutomationDefaults.SESSION_ARCHIVE_DAYS
+    ) -> int:
+        """Clean up old completed sessions and prune the archive"""
         from datetime import timedelta
         
         cutoff_time = datetime.now() - timedelta(hours=hours_old)
-        sessions_to_remove = []
-        
-        for session_id, session in self.sessions.items():
-            if (session.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED] and
-                session.end_time and session.end_time < cutoff_time):
-                sessions_to_remove.append(session_id)
-        
-        # Remove old sessions
-        for session_id in sessions_to_remove:
-            session = self.sessions.pop(session_id, None)
-            if session and session.metadata.get('task_id'):
-                # Also remove from task-to-session mapping
-                task_id = session.metadata['task_id']
-                self.task_to_session.pop(task_id, None)
-        
-        logger.info(f"Cleaned up {len(sessions_to_remove)} old sessions")
-        return len(sessions_to_remove)
\ No newline at end of file
+        removed_count = 0
+        
+        with self._lock:
+            # Only the expired entries at the top of the heap are visited
+            while self._finished_heap and self._finished_heap[0][0] < cutoff_time:
+                end_time, session_id = heapq.heappop(self._finished_heap)
+                if self._finished_at.get(session_id) != end_time:
+                    continue  # Session was removed or finished again later
+                
+                del self._finished_at[session_id]
+                session = self.sessions.pop(session_id)
+                self._status_cache.pop(session_id, None)
+                self._sessions_by_user[session.user_id].discard(session_id)
+                self._sessions_by_source[session.source.value].discard(session_id)
+                self._sessions_by_status[session.status].discard(session_id)
+                self._total_tenders_found -= session.tenders_found
+                self._total_tenders_processed -= session.tenders_processed
+                
+                if session.metadata.get('task_id'):
+                    # Also remove from task-to-session mapping
+                    task_id = session.metadata['task_id']
+                    self.task_to_session.pop(task_id, None)
+                
+                removed_count += 1
+        
+        if self.session_store:
+            archived_removed = self.session_store.delete_ended_before(
+                datetime.now() - timedelta(days=archive_days)
+            )
+            logger.info("Pruned %s archived sessions", archived_removed)
+        
+        logger.info("Cleaned up %s old sessions", removed_count)
+        return removed_count
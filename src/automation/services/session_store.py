@@ -0,0 +1,163 @@
+"""
+Session Store
+SQLite-backed archive of scraping sessions
+"""
+from typing import Dict, Optional, Any, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import sqlite3
+import threading
+
+from ..constants import TaskStatus, SCRAPER_SOURCE_BY_VALUE, TASK_STATUS_BY_VALUE
+from ..types import ScrapingSession, TaskResult
+from core.logging.setup import get_logger
+
+logger = get_logger("session_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    source TEXT NOT NULL,
+    user_id TEXT,
+    created_at TEXT NOT NULL,
+    end_time TEXT,
+    config TEXT NOT NULL,
+    blob TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status);
+CREATE INDEX IF NOT EXISTS idx_sessions_end_time ON sessions (end_time);
+"""
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO sessions (id, status, source, user_id, created_at, end_time, config, blob) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SessionStore:
+    """
+    Archive of finished scraping sessions.
+
+    Sessions are written once they reach a terminal status, so those dropped from
+    memory by cleanup stay available for lookups until their archive retention
+    runs out. The final status and result of the session's task are archived with
+    it; the task itself is not. The database runs in WAL mode, letting readers
+    proceed while a write is in progress.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        session: ScrapingSession,
+        task_status: Optional[TaskStatus] = None,
+        task_result: Optional[TaskResult] = None
+    ) -> None:
+        """Insert or replace a session row along with its task's final outcome"""
+        # Config is fixed at creation, so it is encoded once per session rather than per save
+        if session.config_json is None:
+            session.config_json = json.dumps(session.config, default=str)
+
+        blob = json.dumps({
+            'tenders_found': session.tenders_found,
+            'tenders_processed': session.tenders_processed,
+            'pages_processed': session.pages_processed,
+            'start_time': _isoformat(session.start_time),
+            'error_message': session.error_message,
+            'metadata': session.metadata,
+            'task_status': task_status.value if task_status else None,
+            'task_result': task_result.to_dict() if task_result else None,
+        }, default=str)
+
+        try:
+            with self._lock:
+                self._conn.execute(_UPSERT, (
+                    session.session_id,
+                    session.status.value,
+                    session.source.value,
+                    session.user_id,
+                    session.created_at.isoformat(),
+                    _isoformat(session.end_time),
+                    session.config_json,
+                    blob,
+                ))
+        except sqlite3.Error as e:
+            logger.warning("Failed to persist session %s: %s", session.session_id, e)
+
+    def load(self, session_id: str) -> Optional[Tuple[ScrapingSession, Dict[str, Any]]]:
+        """
+        Load a session by id, or None if it was never stored.
+
+        Returns the session with its task's archived 'task_status' and 'task_result'
+        as they appear in a status response.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT status, source, user_id, created_at, end_time, config, blob "
+                    "FROM sessions WHERE id = ?",
+                    (session_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Failed to load session %s: %s", session_id, e)
+            return None
+
+        if row is None:
+            return None
+
+        status, source, user_id, created_at, end_time, config, blob = row
+        data: Dict[str, Any] = json.loads(blob)
+        session = ScrapingSession(
+            session_id=session_id,
+            source=SCRAPER_SOURCE_BY_VALUE[source],
+            user_id=user_id,
+            config=json.loads(config),
+            status=TASK_STATUS_BY_VALUE[status],
+            tenders_found=data['tenders_found'],
+            tenders_processed=data['tenders_processed'],
+            pages_processed=data['pages_processed'],
+            start_time=_parse(data['start_time']),
+            end_time=_parse(end_time),
+            error_message=data['error_message'],
+            metadata=data['metadata'],
+            created_at=datetime.fromisoformat(created_at),
+            config_json=config,
+        )
+        # Rows written before task outcomes were archived carry neither key
+        task = {'task_status': data.get('task_status'), 'task_result': data.get('task_result')}
+        return session, task
+
+    def delete_ended_before(self, cutoff: datetime) -> int:
+        """Delete sessions that ended before the cutoff, returning how many were removed"""
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM sessions WHERE end_time < ?", (cutoff.isoformat(),)
+                )
+        except sqlite3.Error as e:
+            logger.warning("Failed to prune archived sessions: %s", e)
+            return 0
+
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
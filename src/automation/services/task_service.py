@@ -2,34 +2,79 @@
 Task Service
 Handles task creation, execution, and management
 """
-import uuid
+import asyncio
+import heapq
+import itertools
+import queue
+import statistics
 import time
-from typing import Dict, List, Optional, Any, Callable
+import threading
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, Future
 
-from ..constants import TaskStatus, TaskPriority, AutomationDefaults, ErrorCodes
+from ..constants import (
+    TaskStatus, TaskPriority, AutomationDefaults, ErrorCodes, TASK_PRIORITY_RANK, TERMINAL_TASK_STATUSES
+)
 from ..types import AutomationTask, TaskResult, AutomationMetrics
+from ..ids import generate_id
 from core.logging.setup import get_logger
 
 logger = get_logger("task_service")
 
+# Queue rank for worker stop sentinels: after every real priority
+_STOP_RANK = len(TASK_PRIORITY_RANK)
+
 
 class TaskService:
     """Service for managing automation tasks"""
     
     def __init__(self, max_workers: Optional[int] = None):
         self.max_workers = max_workers or AutomationDefaults.MAX_WORKERS
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+        # Work queue ordered by (priority rank, submission order)
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Optional[AutomationTask]]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
         
         # Task storage
         self.tasks: Dict[str, AutomationTask] = {}
-        self.running_tasks: Dict[str, Future] = {}
+        self.queued_tasks: Set[str] = set()  # Submitted, waiting for a worker
+        self.running_tasks: Set[str] = set()  # Picked up by a worker
+        
+        # Secondary index of task ids by status. Writers hold the lock while
+        # updating stores and indexes together; readers take C-level snapshots
+        # (list()/len()/get()) that are atomic under the GIL and never lock.
+        self._tasks_by_status: Dict[TaskStatus, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+        
+        # Heap of finished tasks keyed on finish time, for cleanup without a full scan.
+        # Results from concurrent workers are recorded out of finish order, so a FIFO would not do.
+        # _finished_at holds each task's current finish time so stale entries are skipped.
+        self._finished_heap: List[Tuple[datetime, str]] = []
+        self._finished_at: Dict[str, datetime] = {}
+        
+        # Callbacks invoked with a task id whenever that task changes status
+        self._state_listeners: List[Callable[[str], None]] = []
         
         # Metrics
         self.metrics = AutomationMetrics()
+        self._execution_time_total = 0.0
+        self._recent_execution_times: "deque[float]" = deque(
+            maxlen=AutomationDefaults.EXECUTION_TIME_SAMPLES
+        )
+        
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"task-worker-{index}", daemon=True)
+            for index in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
         
-        logger.info(f"Task Service initialized with {self.max_workers} workers")
+        logger.info("Task Service initialized with %s workers", self.max_workers)
+    
+    def add_state_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the task id on every status change"""
+        self._state_listeners.append(listener)
     
     def create_task(
         self,
@@ -45,7 +90,7 @@ class TaskService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> str:
         """Create a new automation task"""
-        task_id = f"task_{uuid.uuid4().hex[:12]}"
+        task_id = generate_id("task")
         
         task = AutomationTask(
             id=task_id,
@@ -61,26 +106,28 @@ class TaskService:
             metadata=metadata or {}
         )
         
-        self.tasks[task_id] = task
-        self.metrics.tasks_created += 1
+        with self._lock:
+            self.tasks[task_id] = task
+            self._tasks_by_status[task.status].add(task_id)
+            self.metrics.tasks_created += 1
         
-        logger.info(f"Created task {task_id}: {name}")
+        logger.info("Created task %s: %s", task_id, name)
         return task_id
     
     def submit_task(self, task_id: str) -> bool:
         """Submit task for execution"""
-        if not self._validate_task_for_submission(task_id):
-            return False
-        
-        task = self.tasks[task_id]
-        
-        # Submit to executor
-        future = self.executor.submit(self._execute_task, task)
-        self.running_tasks[task_id] = future
-        task.status = TaskStatus.RUNNING
-        task.last_attempt = datetime.now()
+        with self._lock:
+            task = self._validate_task_for_submission(task_id)
+            if task is None:
+                return False
+            
+            # Queue for the workers, highest priority first
+            self._set_status(task, TaskStatus.RUNNING)
+            task.last_attempt = datetime.now()
+            self.queued_tasks.add(task_id)
+            self._queue.put((TASK_PRIORITY_RANK[task.priority], next(self._sequence), task))
         
-        logger.info(f"Submitted task {task_id} for execution")
+        logger.info("Submitted task %s for execution", task_id)
         return True
     
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
@@ -99,35 +146,34 @@ class TaskService:
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending or running task"""
-        if task_id not in self.tasks:
-            logger.warning(f"Task {task_id} not found for cancellation")
-            return False
-        
-        task = self.tasks[task_id]
-        
-        # Cancel if running
-        if task_id in self.running_tasks:
-            future = self.running_tasks[task_id]
-            if future.cancel():
-                task.status = TaskStatus.CANCELLED
-                del self.running_tasks[task_id]
-                logger.info(f"Cancelled running task {task_id}")
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                logger.warning("Task %s not found for cancellation", task_id)
+                return False
+            
+            # Cancel if queued; the worker skips it when dequeued
+            if task_id in self.queued_tasks:
+                self.queued_tasks.discard(task_id)
+                self._set_status(task, TaskStatus.CANCELLED)
+                logger.info("Cancelled queued task %s", task_id)
                 return True
-        
-        # Cancel if pending
-        if task.status == TaskStatus.PENDING:
-            task.status = TaskStatus.CANCELLED
-            logger.info(f"Cancelled pending task {task_id}")
-            return True
-        
-        return False
+            
+            # Cancel if pending
+            if task.status == TaskStatus.PENDING:
+                self._set_status(task, TaskStatus.CANCELLED)
+                logger.info("Cancelled pending task %s", task_id)
+                return True
+            
+            return False
     
     def list_tasks(self, status_filter: Optional[TaskStatus] = None) -> List[AutomationTask]:
         """List tasks with optional status filter"""
-        tasks = list(self.tasks.values())
-        
         if status_filter:
-            tasks = [task for task in tasks if task.status == status_filter]
+            task_ids = list(self._tasks_by_status.get(status_filter, ()))
+            tasks = [task for task in map(self.tasks.get, task_ids) if task is not None]
+        else:
+            tasks = list(self.tasks.values())
         
         # Sort by creation date (newest first)
         tasks.sort(key=lambda t: t.created_at, reverse=True)
@@ -135,93 +181,141 @@ class TaskService:
     
     def get_metrics(self) -> AutomationMetrics:
         """Get current metrics"""
-        # Update real-time metrics
-        self.metrics.active_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.RUNNING])
-        self.metrics.pending_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.PENDING])
-        self.metrics.retrying_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.RETRYING])
+        # Update real-time metrics from the status index
+        by_status = self._tasks_by_status
+        self.metrics.active_tasks = len(by_status.get(TaskStatus.RUNNING, ()))
+        self.metrics.pending_tasks = len(by_status.get(TaskStatus.PENDING, ()))
+        self.metrics.retrying_tasks = len(by_status.get(TaskStatus.RETRYING, ()))
         self.metrics.total_tasks = len(self.tasks)
         
+        completed = self.metrics.tasks_completed
+        self.metrics.average_execution_time = (
+            self._execution_time_total / completed if completed else 0.0
+        )
+        recent = list(self._recent_execution_times)
+        if len(recent) >= 2:
+            self.metrics.p95_execution_time = statistics.quantiles(recent, n=20, method="inclusive")[-1]
+        elif recent:
+            self.metrics.p95_execution_time = recent[0]
+        
         return self.metrics
     
     def cleanup_completed_tasks(self, hours_old: int = AutomationDefaults.CLEANUP_HOURS) -> int:
         """Clean up old completed tasks"""
         cutoff_time = datetime.now() - timedelta(hours=hours_old)
         
-        tasks_to_remove = []
-        for task_id, task in self.tasks.items():
-            if (task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED] and
-                task.result and 
-                task.result.completed_at and
-                task.result.completed_at < cutoff_time):
-                tasks_to_remove.append(task_id)
-        
-        for task_id in tasks_to_remove:
-            del self.tasks[task_id]
-            if task_id in self.running_tasks:
-                del self.running_tasks[task_id]
-        
-        logger.info(f"Cleaned up {len(tasks_to_remove)} old tasks")
-        return len(tasks_to_remove)
+        removed_count = 0
+        with self._lock:
+            # Only the expired entries at the top of the heap are visited
+            while self._finished_heap and self._finished_heap[0][0] < cutoff_time:
+                finished_at, task_id = heapq.heappop(self._finished_heap)
+                if self._finished_at.get(task_id) != finished_at:
+                    continue  # Task was removed or finished again later
+                
+                del self._finished_at[task_id]
+                task = self.tasks.pop(task_id)
+                self._tasks_by_status[task.status].discard(task_id)
+                self.queued_tasks.discard(task_id)
+                removed_count += 1
+        
+        logger.info("Cleaned up %s old tasks", removed_count)
+        return removed_count
     
     def shutdown(self) -> None:
         """Shutdown the task service"""
         logger.info("Shutting down task service...")
         
         # Cancel all pending tasks
-        for task_id, task in self.tasks.items():
-            if task.status == TaskStatus.PENDING:
-                self.cancel_task(task_id)
+        with self._lock:
+            pending_task_ids = list(self._tasks_by_status[TaskStatus.PENDING])
+        for task_id in pending_task_ids:
+            self.cancel_task(task_id)
         
-        # Wait for running tasks to complete
-        self.executor.shutdown(wait=True)
+        # Let workers drain the queue, then wait for them to finish
+        for _ in self._workers:
+            self._queue.put((_STOP_RANK, next(self._sequence), None))
+        for worker in self._workers:
+            worker.join()
         
         logger.info("Task service shutdown complete")
     
-    def _validate_task_for_submission(self, task_id: str) -> bool:
-        """Validate task can be submitted"""
-        if task_id not in self.tasks:
-            logger.error(f"Task {task_id} not found")
-            return False
+    def _set_status(self, task: AutomationTask, status: TaskStatus) -> None:
+        """Change a task's status and move it to the matching index bucket"""
+        with self._lock:
+            self._tasks_by_status[task.status].discard(task.id)
+            task.status = status
+            self._tasks_by_status[status].add(task.id)
+            
+            if status in TERMINAL_TASK_STATUSES:
+                finished_at = task.result.completed_at if task.result and task.result.completed_at else datetime.now()
+                self._finished_at[task.id] = finished_at
+                heapq.heappush(self._finished_heap, (finished_at, task.id))
+            else:
+                self._finished_at.pop(task.id, None)
         
-        task = self.tasks[task_id]
+        for listener in self._state_listeners:
+            listener(task.id)
+    
+    def _validate_task_for_submission(self, task_id: str) -> Optional[AutomationTask]:
+        """Return the task if it can be submitted, otherwise None"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            logger.error("Task %s not found", task_id)
+            return None
         
         # Check dependencies
         if not self._check_dependencies(task):
-            logger.warning(f"Task {task_id} dependencies not satisfied")
-            return False
+            logger.warning("Task %s dependencies not satisfied", task_id)
+            return None
         
-        # Check if already running
-        if task_id in self.running_tasks:
-            logger.warning(f"Task {task_id} is already running")
-            return False
+        # Check if already queued or running
+        if task_id in self.queued_tasks or task_id in self.running_tasks:
+            logger.warning("Task %s is already running", task_id)
+            return None
         
-        return True
+        return task
     
     def _check_dependencies(self, task: AutomationTask) -> bool:
         """Check if task dependencies are satisfied"""
         for dep_id in task.dependencies:
-            if dep_id not in self.tasks:
-                return False
-            
-            dep_task = self.tasks[dep_id]
-            if dep_task.status != TaskStatus.COMPLETED:
+            dep_task = self.tasks.get(dep_id)
+            if dep_task is None or dep_task.status != TaskStatus.COMPLETED:
                 return False
         
         return True
     
+    def _worker_loop(self) -> None:
+        """Run queued tasks in priority order until a stop sentinel arrives"""
+        while True:
+            _, _, task = self._queue.get()
+            if task is None:
+                break
+            
+            with self._lock:
+                if task.id not in self.queued_tasks:
+                    continue  # Cancelled or cleaned up while queued
+                self.queued_tasks.discard(task.id)
+                self.running_tasks.add(task.id)
+            
+            self._execute_task(task)
+    
     def _execute_task(self, task: AutomationTask) -> TaskResult:
         """Execute a single task"""
+        # One clock read at each end of the run; datetimes derive from it
         start_time = time.time()
-        started_at = datetime.now()
+        started_at = datetime.fromtimestamp(start_time)
         
-        logger.info(f"Executing task {task.id}: {task.name}")
+        logger.info("Executing task %s: %s", task.id, task.name)
         
         try:
-            # Execute the task function
+            # Execute the task function; async scrapers run to completion on this worker
             result = task.function(*task.args, **task.kwargs)
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
             
-            execution_time = time.time() - start_time
-            completed_at = datetime.now()
+            end_time = time.time()
+            execution_time = end_time - start_time
+            completed_at = datetime.fromtimestamp(end_time)
             
             task_result = TaskResult(
                 task_id=task.id,
@@ -233,18 +327,20 @@ class TaskService:
                 metadata=task.metadata
             )
             
-            task.status = TaskStatus.COMPLETED
             task.result = task_result
+            self._set_status(task, TaskStatus.COMPLETED)
             
             # Update metrics
             self.metrics.tasks_completed += 1
             self._update_average_execution_time(execution_time)
             
-            logger.info(f"Task {task.id} completed successfully in {execution_time:.2f}s")
+            logger.info("Task %s completed successfully in %.2fs", task.id, execution_time)
             return task_result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            end_time = time.time()
+            execution_time = end_time - start_time
+            completed_at = datetime.fromtimestamp(end_time)
             error_msg = str(e)
             
             task_result = TaskResult(
@@ -253,41 +349,33 @@ class TaskService:
                 error=error_msg,
                 execution_time=execution_time,
                 started_at=started_at,
-                completed_at=datetime.now(),
+                completed_at=completed_at,
                 metadata=task.metadata
             )
             
-            task.status = TaskStatus.FAILED
             task.result = task_result
+            self._set_status(task, TaskStatus.FAILED)
             
             # Schedule retry if applicable
             if task.can_retry():
                 task.retry_count += 1
-                task.next_retry = datetime.now() + timedelta(seconds=task.retry_delay)
-                task.status = TaskStatus.RETRYING
+                task.next_retry = completed_at + timedelta(seconds=task.retry_delay)
+                self._set_status(task, TaskStatus.RETRYING)
                 self.metrics.tasks_retried += 1
                 
-                logger.warning(f"Task {task.id} failed, scheduling retry {task.retry_count}/{task.max_retries}")
+                logger.warning("Task %s failed, scheduling retry %s/%s", task.id, task.retry_count, task.max_retries)
             else:
                 self.metrics.tasks_failed += 1
-                logger.error(f"Task {task.id} failed permanently: {error_msg}")
+                logger.error("Task %s failed permanently: %s", task.id, error_msg)
             
             return task_result
         
         finally:
             # Remove from running tasks
-            if task.id in self.running_tasks:
-                del self.running_tasks[task.id]
+            with self._lock:
+                self.running_tasks.discard(task.id)
     
     def _update_average_execution_time(self, execution_time: float) -> None:
-        """Update average execution time metric"""
-        total_completed = self.metrics.tasks_completed
-        current_avg = self.metrics.average_execution_time
-        
-        # Calculate new average
-        if total_completed == 1:
-            new_avg = execution_time
-        else:
-            new_avg = ((current_avg * (total_completed - 1)) + execution_time) / total_completed
-        
-        self.metrics.average_execution_time = new_avg
\ No newline at end of file
+        """Record a completed task's execution time; averages are derived in get_metrics"""
+        self._execution_time_total += execution_time
+        self._recent_execution_times.append(execution_time)
\ No newline at end of file
@@ -3,16 +3,24 @@ Background Task Manager for VisionSeal Automation
 Handles scheduling, execution, and monitoring of automation tasks
 """
 import asyncio
+import heapq
+import importlib
+import itertools
+import sys
 import threading
 import time
-import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional, Callable, Union
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor, Future, InvalidStateError, wait
+from collections import defaultdict, deque
+import functools
 import json
+import logging
 
+from automation.constants import SCRAPER_FUNCTIONS
+from automation.ids import generate_id
 from core.config.settings import settings
 from core.config.manager import config_manager
 from core.logging.setup import get_logger
@@ -41,7 +49,12 @@ class TaskPriority(Enum):
     URGENT = 4
 
 
-@dataclass
+# Statuses whose tasks are removed by cleanup once old enough
+_FINISHED_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+_TASK_RETENTION = timedelta(hours=24)
+
+
+@dataclass(slots=True)
 class TaskResult:
     """Result of task execution"""
     task_id: str
@@ -54,12 +67,12 @@ class TaskResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationTask:
     """Automation task definition"""
     id: str
     name: str
-    function: Callable
+    function: Callable  # Plain function or coroutine function
     args: tuple = field(default_factory=tuple)
     kwargs: Dict[str, Any] = field(default_factory=dict)
     priority: TaskPriority = TaskPriority.MEDIUM
@@ -83,37 +96,75 @@ class TaskManager:
     """Background task manager for automation workflows"""
     
     def __init__(self, max_workers: int = None):
-        # Get configuration from config manager
-        automation_config = config_manager.get_automation_config()
-        task_manager_config = automation_config.get('task_manager', {})
+        # Task manager settings are read once here; call reload_config() to pick up edits
+        self.task_config: Dict[str, Any] = {}
+        self.reload_config()
         
         self.max_workers = (
             max_workers or 
-            task_manager_config.get('max_workers') or 
+            self.task_config.get('max_workers') or 
             settings.automation.max_workers or 
             4
         )
+        # Plain callables run on the thread pool; scraper coroutines run directly
+        # on one persistent event loop, where max_workers worker coroutines take
+        # submitted tasks from a priority queue (most urgent first, FIFO within a level)
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._loop = asyncio.new_event_loop()
+        if sys.version_info >= (3, 12):
+            # Run each task's synchronous prefix inline instead of via the ready queue
+            self._loop.set_task_factory(asyncio.eager_task_factory)
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="task-manager-loop", daemon=True
+        )
+        self._loop_thread.start()
+        self._queue: "asyncio.PriorityQueue[Tuple[float, int, Optional[AutomationTask], Optional[Future]]]" = (
+            asyncio.PriorityQueue()
+        )
+        self._sequence = itertools.count()
         
         # Task storage
         self.tasks: Dict[str, AutomationTask] = {}
         self.running_tasks: Dict[str, Future] = {}
         self.completed_tasks: Dict[str, TaskResult] = {}
+        # Task ids by current status; kept in step by _set_status
+        self._tasks_by_status: Dict[TaskStatus, Set[str]] = {status: set() for status in TaskStatus}
+        # Guards writes to the task dicts, the status index and metrics. The scheduler,
+        # the loop thread and API callers all write; reads use .get()/list() snapshots.
+        self._lock = threading.RLock()
+        # Finished tasks in the order they completed, for cleanup without a full scan.
+        # _finished_at holds each task's current completion time so stale entries are skipped.
+        self._finished_queue: "deque[Tuple[datetime, str]]" = deque()
+        self._finished_at: Dict[str, datetime] = {}
+        # Reverse dependency index: task id -> ids of tasks waiting on it
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
         
         # Scheduling
         self.scheduler_running = False
         self.scheduler_thread: Optional[threading.Thread] = None
-        
-        # Metrics
-        self.metrics = {
-            'tasks_created': 0,
-            'tasks_completed': 0,
-            'tasks_failed': 0,
-            'tasks_retried': 0,
-            'average_execution_time': 0.0
-        }
-        
-        logger.info(f"Task Manager initialized with {self.max_workers} workers")
+        # Retries ordered by due time (epoch seconds). The scheduler sleeps on _wakeup
+        # until the next retry or expiry is due and is notified when either queue gains a new head.
+        self._retry_heap: List[Tuple[float, str]] = []
+        self._wakeup = threading.Condition()
+        
+        # Metrics; incremented under the lock, assembled into a dict by get_metrics
+        self.tasks_created = 0
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.tasks_retried = 0
+        self.execution_time_total = 0.0
+        
+        self._workers = [
+            asyncio.run_coroutine_threadsafe(self._worker(), self._loop)
+            for _ in range(self.max_workers)
+        ]
+        
+        logger.info("Task Manager initialized with %s workers", self.max_workers)
+    
+    def reload_config(self) -> None:
+        """Re-read the task manager section of the automation config"""
+        automation_config = config_manager.get_automation_config()
+        self.task_config = automation_config.get('task_manager', {})
     
     def create_task(
         self,
@@ -130,7 +181,7 @@ class TaskManager:
         metadata: Dict[str, Any] = None
     ) -> str:
         """Create a new automation task"""
-        task_id = f"task_{uuid.uuid4().hex[:12]}"
+        task_id = generate_id("task")
         
         task = AutomationTask(
             id=task_id,
@@ -147,56 +198,128 @@ class TaskManager:
             metadata=metadata or {}
         )
         
-        self.tasks[task_id] = task
-        self.metrics['tasks_created'] += 1
+        with self._lock:
+            self.tasks[task_id] = task
+            self._tasks_by_status[task.status].add(task_id)
+            for dep_id in task.dependencies:
+                self._dependents[dep_id].add(task_id)
+            self.tasks_created += 1
         
-        logger.info(f"Created task {task_id}: {name}")
+        logger.info("Created task %s: %s", task_id, name)
         return task_id
     
     def submit_task(self, task_id: str) -> bool:
         """Submit task for execution"""
-        if task_id not in self.tasks:
-            logger.error(f"Task {task_id} not found")
-            return False
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                logger.error("Task %s not found", task_id)
+                return False
+            
+            if not self._can_submit(task):
+                return False
+            
+            self._dispatch(task)
         
-        task = self.tasks[task_id]
+        logger.info("Submitted task %s for execution", task_id)
+        return True
+    
+    def submit_many(self, task_ids: List[str]) -> List[str]:
+        """Submit several tasks under one lock acquisition; returns the ids submitted"""
+        with self._lock:
+            ready: Dict[str, AutomationTask] = {}
+            for task_id in task_ids:
+                task = self.tasks.get(task_id)
+                if task is None:
+                    logger.error("Task %s not found", task_id)
+                elif task_id not in ready and self._can_submit(task):
+                    ready[task_id] = task
+            
+            if ready:
+                self._dispatch(*ready.values())
         
-        # Check dependencies
+        logger.info("Submitted %s tasks for execution", len(ready))
+        return list(ready)
+    
+    def _can_submit(self, task: AutomationTask) -> bool:
+        """Check that a task's dependencies are met and it is not already running"""
         if not self._check_dependencies(task):
-            logger.warning(f"Task {task_id} dependencies not satisfied")
+            logger.warning("Task %s dependencies not satisfied", task.id)
             return False
         
-        # Check if already running
-        if task_id in self.running_tasks:
-            logger.warning(f"Task {task_id} is already running")
+        if task.id in self.running_tasks:
+            logger.warning("Task %s is already running", task.id)
             return False
         
-        # Submit to executor
-        future = self.executor.submit(self._execute_task, task)
-        self.running_tasks[task_id] = future
-        task.status = TaskStatus.RUNNING
-        task.last_attempt = datetime.now(timezone.utc)
-        
-        logger.info(f"Submitted task {task_id} for execution")
         return True
     
-    def _execute_task(self, task: AutomationTask) -> TaskResult:
+    def _dispatch(self, *tasks: AutomationTask) -> None:
+        """Mark tasks running and queue them for the workers; caller holds the lock"""
+        items = []
+        for task in tasks:
+            task_id = task.id
+            self._set_status(task, TaskStatus.RUNNING)
+            task.last_attempt = datetime.now(timezone.utc)
+            future: Future = Future()
+            self.running_tasks[task_id] = future
+            future.add_done_callback(lambda _, task_id=task_id: self._on_task_done(task_id))
+            items.append((-task.priority.value, next(self._sequence), task, future))
+        
+        # One hop onto the task loop for the whole batch
+        self._loop.call_soon_threadsafe(self._put_all, items)
+    
+    def _put_all(self, items: List[tuple]) -> None:
+        """Queue a batch of work items; runs on the task loop"""
+        for item in items:
+            self._queue.put_nowait(item)
+    
+    async def _worker(self) -> None:
+        """Run queued tasks in priority order until a stop sentinel arrives"""
+        while True:
+            _, _, task, future = await self._queue.get()
+            if task is None:
+                break
+            if asyncio.iscoroutinefunction(task.function):
+                if future.cancelled():
+                    continue  # Cancelled while queued
+            elif not future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued; once marked running, a thread-pool call cannot be cancelled
+            
+            run = asyncio.ensure_future(self._execute_task(task))
+            
+            def stop_run(done: Future, run: asyncio.Future = run) -> None:
+                # cancel_task cancels the future from another thread; stop the run with it
+                if done.cancelled():
+                    self._loop.call_soon_threadsafe(run.cancel)
+            
+            future.add_done_callback(stop_run)
+            try:
+                result = await run
+            except asyncio.CancelledError:
+                continue
+            
+            try:
+                future.set_result(result)
+            except InvalidStateError:
+                pass  # Cancelled as the run finished
+    
+    async def _execute_task(self, task: AutomationTask) -> TaskResult:
         """Execute a single task"""
-        start_time = time.time()
+        # One wall-clock read per run; completion time is derived from the monotonic duration
+        start_time = time.monotonic()
         started_at = datetime.now(timezone.utc)
         
-        logger.info(f"Executing task {task.id}: {task.name}")
+        logger.info("Executing task %s: %s", task.id, task.name)
         
         try:
-            # Execute the task function
+            # Execute the task function, bounded by its timeout if it has one
             if task.timeout:
-                # TODO: Implement timeout handling
-                result = task.function(*task.args, **task.kwargs)
+                result = await asyncio.wait_for(self._call_task_function(task), timeout=task.timeout)
             else:
-                result = task.function(*task.args, **task.kwargs)
+                result = await self._call_task_function(task)
             
-            execution_time = time.time() - start_time
-            completed_at = datetime.now(timezone.utc)
+            execution_time = time.monotonic() - start_time
+            completed_at = started_at + timedelta(seconds=execution_time)
             
             task_result = TaskResult(
                 task_id=task.id,
@@ -208,19 +331,29 @@ class TaskManager:
                 metadata=task.metadata
             )
             
-            task.status = TaskStatus.COMPLETED
-            task.result = task_result
-            
-            # Update metrics
-            self.metrics['tasks_completed'] += 1
-            self._update_average_execution_time(execution_time)
+            with self._lock:
+                if task.status is TaskStatus.CANCELLED:
+                    return task_result  # Cancelled as the run finished; keep the cancellation
+                
+                task.result = task_result
+                self._set_status(task, TaskStatus.COMPLETED)
+                
+                # Update metrics
+                self.tasks_completed += 1
+                self.execution_time_total += execution_time
+                
+                self._dispatch_ready_dependents(task.id)
             
-            logger.info(f"Task {task.id} completed successfully in {execution_time:.2f}s")
+            logger.info("Task %s completed successfully in %.2fs", task.id, execution_time)
             return task_result
             
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = str(e)
+            execution_time = time.monotonic() - start_time
+            completed_at = started_at + timedelta(seconds=execution_time)
+            if isinstance(e, asyncio.TimeoutError):
+                error_msg = f"Task timed out after {task.timeout}s"
+            else:
+                error_msg = str(e)
             
             task_result = TaskResult(
                 task_id=task.id,
@@ -228,31 +361,83 @@ class TaskManager:
                 error=error_msg,
                 execution_time=execution_time,
                 started_at=started_at,
-                completed_at=datetime.now(timezone.utc),
+                completed_at=completed_at,
                 metadata=task.metadata
             )
             
-            task.status = TaskStatus.FAILED
-            task.result = task_result
-            
-            # Schedule retry if applicable
-            if task.retry_count < task.max_retries:
-                task.retry_count += 1
-                task.next_retry = datetime.now(timezone.utc) + timedelta(seconds=task.retry_delay)
-                task.status = TaskStatus.RETRYING
-                self.metrics['tasks_retried'] += 1
+            with self._lock:
+                if task.status is TaskStatus.CANCELLED:
+                    return task_result
                 
-                logger.warning(f"Task {task.id} failed, scheduling retry {task.retry_count}/{task.max_retries}")
-            else:
-                self.metrics['tasks_failed'] += 1
-                logger.error(f"Task {task.id} failed permanently: {error_msg}")
+                task.result = task_result
+                self._set_status(task, TaskStatus.FAILED)
+                
+                # Schedule retry if applicable
+                if task.retry_count < task.max_retries:
+                    task.retry_count += 1
+                    task.next_retry = completed_at + timedelta(seconds=task.retry_delay)
+                    self._set_status(task, TaskStatus.RETRYING)
+                    self.tasks_retried += 1
+                    
+                    logger.warning("Task %s failed, scheduling retry %s/%s", task.id, task.retry_count, task.max_retries)
+                else:
+                    self.tasks_failed += 1
+                    logger.error("Task %s failed permanently: %s", task.id, error_msg)
             
             return task_result
+    
+    async def _call_task_function(self, task: AutomationTask) -> Any:
+        """Await coroutine functions on the loop; run plain callables on the thread pool"""
+        if asyncio.iscoroutinefunction(task.function):
+            return await task.function(*task.args, **task.kwargs)
         
-        finally:
-            # Remove from running tasks
-            if task.id in self.running_tasks:
-                del self.running_tasks[task.id]
+        call = functools.partial(task.function, *task.args, **task.kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+    
+    def _on_task_done(self, task_id: str) -> None:
+        """Release a finished task's slot and queue its retry if one was scheduled"""
+        with self._lock:
+            self.running_tasks.pop(task_id, None)
+        
+        task = self.tasks.get(task_id)
+        if task and task.status == TaskStatus.RETRYING and task.next_retry:
+            with self._wakeup:
+                heapq.heappush(self._retry_heap, (task.next_retry.timestamp(), task_id))
+                self._wakeup.notify()
+    
+    def _set_status(self, task: AutomationTask, status: TaskStatus) -> None:
+        """Change a task's status and move it to the matching index bucket"""
+        with self._lock:
+            self._tasks_by_status[task.status].discard(task.id)
+            task.status = status
+            self._tasks_by_status[status].add(task.id)
+            
+            if status in _FINISHED_STATUSES and task.result and task.result.completed_at:
+                self._finished_at[task.id] = task.result.completed_at
+                self._finished_queue.append((task.result.completed_at, task.id))
+                if len(self._finished_queue) == 1:
+                    # First expiry to wait for; the scheduler may be sleeping with no deadline
+                    with self._wakeup:
+                        self._wakeup.notify()
+            else:
+                self._finished_at.pop(task.id, None)
+    
+    def _dispatch_ready_dependents(self, task_id: str) -> None:
+        """Start pending tasks whose last outstanding dependency was task_id; caller holds the lock"""
+        ready = []
+        for dependent_id in self._dependents.pop(task_id, ()):
+            dependent = self.tasks.get(dependent_id)
+            if (
+                dependent is not None
+                and dependent.status == TaskStatus.PENDING
+                and dependent_id not in self.running_tasks
+                and self._check_dependencies(dependent)
+            ):
+                ready.append(dependent)
+        
+        if ready:
+            logger.info("Dependencies of %s met, submitting %s dependent tasks", task_id, len(ready))
+            self._dispatch(*ready)
     
     def _check_dependencies(self, task: AutomationTask) -> bool:
         """Check if task dependencies are satisfied"""
@@ -266,15 +451,6 @@ class TaskManager:
         
         return True
     
-    def _update_average_execution_time(self, execution_time: float):
-        """Update average execution time metric"""
-        total_completed = self.metrics['tasks_completed']
-        current_avg = self.metrics['average_execution_time']
-        
-        # Calculate new average
-        new_avg = ((current_avg * (total_completed - 1)) + execution_time) / total_completed
-        self.metrics['average_execution_time'] = new_avg
-    
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """Get current status of a task"""
         if task_id in self.tasks:
@@ -289,27 +465,27 @@ class TaskManager:
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending or running task"""
-        if task_id not in self.tasks:
-            return False
-        
-        task = self.tasks[task_id]
-        
-        # Cancel if running
-        if task_id in self.running_tasks:
-            future = self.running_tasks[task_id]
-            if future.cancel():
-                task.status = TaskStatus.CANCELLED
-                del self.running_tasks[task_id]
-                logger.info(f"Cancelled running task {task_id}")
+        with self._lock:
+            if task_id not in self.tasks:
+                return False
+            
+            task = self.tasks[task_id]
+            
+            # Cancel if running
+            if task_id in self.running_tasks:
+                future = self.running_tasks[task_id]
+                if future.cancel():
+                    self._set_status(task, TaskStatus.CANCELLED)
+                    logger.info("Cancelled running task %s", task_id)
+                    return True
+            
+            # Cancel if pending
+            if task.status == TaskStatus.PENDING:
+                self._set_status(task, TaskStatus.CANCELLED)
+                logger.info("Cancelled pending task %s", task_id)
                 return True
-        
-        # Cancel if pending
-        if task.status == TaskStatus.PENDING:
-            task.status = TaskStatus.CANCELLED
-            logger.info(f"Cancelled pending task {task_id}")
-            return True
-        
-        return False
+            
+            return False
     
     def start_scheduler(self):
         """Start the background scheduler"""
@@ -324,6 +500,8 @@ class TaskManager:
     def stop_scheduler(self):
         """Stop the background scheduler"""
         self.scheduler_running = False
+        with self._wakeup:
+            self._wakeup.notify()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         logger.info("Task scheduler stopped")
@@ -341,25 +519,50 @@ class TaskManager:
                 # Clean up completed tasks
                 self._cleanup_old_tasks()
                 
-                time.sleep(30)  # Check every 30 seconds
+                # Sleep until the next retry or expiry is due, or until notified
+                with self._wakeup:
+                    if self.scheduler_running:
+                        self._wakeup.wait(self._seconds_until_next_due())
                 
             except Exception as e:
-                logger.error(f"Scheduler error: {str(e)}")
+                logger.error("Scheduler error: %s", e)
                 time.sleep(60)  # Wait longer on error
     
+    def _seconds_until_next_due(self) -> Optional[float]:
+        """Time until the earliest retry or task expiry, or None if nothing is queued"""
+        deadlines = []
+        if self._retry_heap:
+            deadlines.append(self._retry_heap[0][0])
+        if self._finished_queue:
+            deadlines.append((self._finished_queue[0][0] + _TASK_RETENTION).timestamp())
+        
+        if not deadlines:
+            return None
+        return max(min(deadlines) - time.time(), 0.0)
+    
     def _process_retries(self):
         """Process tasks ready for retry"""
-        now = datetime.now(timezone.utc)
-        
-        for task_id, task in self.tasks.items():
-            if (task.status == TaskStatus.RETRYING and 
-                task.next_retry and 
-                now >= task.next_retry):
+        now = time.time()
+        due = []
+        with self._wakeup:
+            while self._retry_heap and self._retry_heap[0][0] <= now:
+                due.append(heapq.heappop(self._retry_heap)[1])
+        
+        with self._lock:
+            retries = []
+            for task_id in due:
+                task = self.tasks.get(task_id)
+                # Skip tasks cancelled or resubmitted while waiting
+                if task is None or task.status != TaskStatus.RETRYING or task_id in self.running_tasks:
+                    continue
                 
-                logger.info(f"Retrying task {task_id} (attempt {task.retry_count})")
-                task.status = TaskStatus.PENDING
+                logger.info("Retrying task %s (attempt %s)", task_id, task.retry_count)
                 task.next_retry = None
-                self.submit_task(task_id)
+                retries.append(task)
+            
+            # Dependencies were satisfied on the first run, so retries skip the checks
+            if retries:
+                self._dispatch(*retries)
     
     def _process_scheduled_tasks(self):
         """Process recurring scheduled tasks"""
@@ -368,28 +571,33 @@ class TaskManager:
     
     def _cleanup_old_tasks(self):
         """Clean up old completed tasks"""
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-        
-        to_remove = []
-        for task_id, task in self.tasks.items():
-            if (task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED] and
-                task.result and 
-                task.result.completed_at and
-                task.result.completed_at < cutoff):
-                to_remove.append(task_id)
-        
-        for task_id in to_remove:
-            del self.tasks[task_id]
-            if task_id in self.completed_tasks:
-                del self.completed_tasks[task_id]
+        cutoff = datetime.now(timezone.utc) - _TASK_RETENTION
+        
+        with self._lock:
+            # Only the expired head of the completion-ordered queue is visited
+            while self._finished_queue and self._finished_queue[0][0] < cutoff:
+                completed_at, task_id = self._finished_queue.popleft()
+                if self._finished_at.get(task_id) != completed_at:
+                    continue  # Task was retried or finished again later
+                
+                del self._finished_at[task_id]
+                task = self.tasks.pop(task_id)
+                self._tasks_by_status[task.status].discard(task_id)
+                self.completed_tasks.pop(task_id, None)
+                self._dependents.pop(task_id, None)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get task manager metrics"""
+        completed = self.tasks_completed
         return {
-            **self.metrics,
-            'active_tasks': len([t for t in self.tasks.values() if t.status == TaskStatus.RUNNING]),
-            'pending_tasks': len([t for t in self.tasks.values() if t.status == TaskStatus.PENDING]),
-            'retrying_tasks': len([t for t in self.tasks.values() if t.status == TaskStatus.RETRYING]),
+            'tasks_created': self.tasks_created,
+            'tasks_completed': completed,
+            'tasks_failed': self.tasks_failed,
+            'tasks_retried': self.tasks_retried,
+            'average_execution_time': self.execution_time_total / completed if completed else 0.0,
+            'active_tasks': len(self._tasks_by_status[TaskStatus.RUNNING]),
+            'pending_tasks': len(self._tasks_by_status[TaskStatus.PENDING]),
+            'retrying_tasks': len(self._tasks_by_status[TaskStatus.RETRYING]),
             'total_tasks': len(self.tasks)
         }
     
@@ -401,12 +609,19 @@ class TaskManager:
         self.stop_scheduler()
         
         # Cancel all pending tasks
-        for task_id, task in self.tasks.items():
-            if task.status == TaskStatus.PENDING:
-                self.cancel_task(task_id)
-        
-        # Wait for running tasks to complete
+        for task_id in list(self._tasks_by_status[TaskStatus.PENDING]):
+            self.cancel_task(task_id)
+        
+        # Wait for running tasks to complete, then stop the workers
+        wait(list(self.running_tasks.values()))
+        for _ in self._workers:
+            item = (float('inf'), next(self._sequence), None, None)
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        wait(self._workers, timeout=5)
         self.executor.shutdown(wait=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        self._loop.close()
         
         logger.info("Task manager shutdown complete")
 
@@ -422,68 +637,28 @@ class AutomationTaskManager:
         self._scrapers = {}
         self._load_scrapers()
         
+        # Merged configs for sessions scheduled without overrides, by (source, profile)
+        self._merged_config_cache: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        
         logger.info("Automation Task Manager initialized")
     
+    def reload_config(self) -> None:
+        """Pick up configuration changes made since the last schedule"""
+        self.task_manager.reload_config()
+        self._merged_config_cache.clear()
+    
     def _load_scrapers(self):
-        """Load available scrapers with enhanced capabilities"""
+        """Import every registered scraper function in a single pass"""
         self._scrapers = {}
         
-        # Try to load production scrapers first
-        try:
-            from automation.scrapers.ungm_playwright_scraper import run_ungm_scraping
-            from automation.scrapers.tunipages_scraper import run_tunipages_scraping
-            
-            self._scrapers = {
-                'ungm': run_ungm_scraping,  # UNGM Playwright scraper
-                'tunipages': run_tunipages_scraping  # TuniPages scraper with auth + documents
-            }
-            
-            logger.info(f"✅ Loaded {len(self._scrapers)} PRODUCTION scrapers (Playwright + Document Processing)")
-            
-        except ImportError as e:
-            logger.warning(f"Production scrapers not available: {str(e)}, trying individual imports")
-            
-            # Fallback to individual loading
+        for source, function_path in SCRAPER_FUNCTIONS.items():
+            module_name, function_name = function_path.rsplit('.', 1)
             try:
-                self._scrapers = {}
-                
-                try:
-                    from automation.scrapers.ungm_playwright_scraper import run_ungm_scraping_sync
-                    self._scrapers['ungm'] = run_ungm_scraping_sync
-                    logger.info("✅ Loaded UNGM scraper individually (sync wrapper)")
-                except ImportError:
-                    logger.warning("❌ Could not load UNGM scraper")
-                
-                try:
-                    from automation.scrapers.tunipages_scraper import run_tunipages_scraping_sync
-                    self._scrapers['tunipages'] = run_tunipages_scraping_sync
-                    logger.info("✅ Loaded TuniPages scraper individually (sync wrapper)")
-                except ImportError:
-                    logger.warning("❌ Could not load TuniPages scraper")
-                
-                logger.info(f"⚠️ Loaded {len(self._scrapers)} scrapers individually")
-                
-            except ImportError as e2:
-                logger.error(f"Could not load any scrapers: {str(e2)}")
-                # Last resort - try to load individual scrapers
-                self._load_individual_scrapers()
-    
-    def _load_individual_scrapers(self):
-        """Load individual scrapers as last resort"""
-        # Try production scrapers individually (using sync wrappers)
-        try:
-            from automation.scrapers.ungm_playwright_scraper import run_ungm_scraping_sync
-            self._scrapers['ungm'] = run_ungm_scraping_sync
-            logger.info("✅ Loaded UNGM scraper individually (sync wrapper)")
-        except ImportError:
-            logger.warning("❌ Could not load UNGM scraper")
+                self._scrapers[source] = getattr(importlib.import_module(module_name), function_name)
+            except (ImportError, AttributeError) as e:
+                logger.warning("❌ Could not load %s scraper: %s", source, e)
         
-        try:
-            from automation.scrapers.tunipages_scraper import run_tunipages_scraping_sync
-            self._scrapers['tunipages'] = run_tunipages_scraping_sync
-            logger.info("✅ Loaded TuniPages scraper individually (sync wrapper)")
-        except ImportError:
-            logger.warning("❌ Could not load TuniPages scraper")
+        logger.info("✅ Loaded %s scrapers", len(self._scrapers))
     
     def schedule_scraping_session(
         self,
@@ -493,27 +668,53 @@ class AutomationTaskManager:
         profile: Optional[str] = None
     ) -> Optional[str]:
         """Schedule a scraping session"""
+        task_id = self._create_scraping_task(source, config, priority, profile)
+        if task_id is None:
+            return None
+        
+        # Submit immediately
+        if self.task_manager.submit_task(task_id):
+            logger.info("Scheduled %s scraping session: %s", source, task_id)
+            return task_id
+        
+        return None
+    
+    def _create_scraping_task(
+        self,
+        source: str,
+        config: Optional[Dict[str, Any]],
+        priority: TaskPriority,
+        profile: Optional[str]
+    ) -> Optional[str]:
+        """Create the task for a scraping session without submitting it"""
         if source not in self._scrapers:
-            logger.error(f"Unknown scraper source: {source}")
+            logger.error("Unknown scraper source: %s", source)
             return None
 
-        # Get merged configuration
-        merged_config = config_manager.get_merged_config(
-            scraper=source,
-            profile=profile,
-            overrides=config
-        )
+        # Get merged configuration; without overrides it only depends on (source, profile)
+        if config is None:
+            cached = self._merged_config_cache.get((source, profile))
+            if cached is None:
+                cached = config_manager.get_merged_config(scraper=source, profile=profile)
+                self._merged_config_cache[(source, profile)] = cached
+            merged_config = dict(cached)  # Each task gets its own copy to mutate
+        else:
+            merged_config = config_manager.get_merged_config(
+                scraper=source,
+                profile=profile,
+                overrides=config
+            )
         
         scraper_function = self._scrapers[source]
         task_name = f"Scraping {source.upper()} for Topaza.net"
         
         # Debug logging
-        logger.info(f"🔍 Using scraper function: {scraper_function.__name__} for source: {source}")
-        logger.info(f"🔍 Available scrapers: {list(self._scrapers.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 Using scraper function: %s for source: %s", scraper_function.__name__, source)
+            logger.debug("🔍 Available scrapers: %s", list(self._scrapers.keys()))
         
-        # Get task settings from config
-        automation_config = config_manager.get_automation_config()
-        task_config = automation_config.get('task_manager', {})
+        # Task settings cached by the task manager
+        task_config = self.task_manager.task_config
         
         task_id = self.task_manager.create_task(
             name=task_name,
@@ -531,30 +732,24 @@ class AutomationTaskManager:
             }
         )
         
-        # Submit immediately
-        if self.task_manager.submit_task(task_id):
-            logger.info(f"Scheduled {source} scraping session: {task_id}")
-            return task_id
-        
-        return None
+        return task_id
     
     def schedule_all_scrapers(
         self,
         config: Optional[Dict[str, Any]] = None
     ) -> List[str]:
         """Schedule all available scrapers"""
-        task_ids = []
+        created = []
         
         for source in self._scrapers.keys():
-            task_id = self.schedule_scraping_session(
-                source=source,
-                config=config,
-                priority=TaskPriority.HIGH
-            )
+            task_id = self._create_scraping_task(source, config, TaskPriority.HIGH, None)
             if task_id:
-                task_ids.append(task_id)
+                created.append(task_id)
+        
+        # One submission for the whole batch
+        task_ids = self.task_manager.submit_many(created)
         
-        logger.info(f"Scheduled {len(task_ids)} scraping sessions")
+        logger.info("Scheduled %s scraping sessions", len(task_ids))
         return task_ids
     
     def get_session_status(self, task_id: str) -> Dict[str, Any]:
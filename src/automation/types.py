@@ -10,7 +10,7 @@ from enum import Enum
 from .constants import TaskStatus, TaskPriority, ScraperSource
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result of task execution"""
     task_id: str
@@ -21,26 +21,42 @@ class TaskResult:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # (started_at, completed_at) ISO strings, filled once the result is final
+    iso_timestamps: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def is_successful(self) -> bool:
         """Check if task completed successfully"""
         return self.status == TaskStatus.COMPLETED and self.error is None
 
+    def _format_timestamps(self) -> tuple:
+        """ISO timestamps, cached after completion since they no longer change"""
+        if self.iso_timestamps is not None:
+            return self.iso_timestamps
+
+        timestamps = (
+            self.started_at.isoformat() if self.started_at else None,
+            self.completed_at.isoformat() if self.completed_at else None,
+        )
+        if self.completed_at is not None:
+            self.iso_timestamps = timestamps
+        return timestamps
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
+        started_at, completed_at = self._format_timestamps()
         return {
             'task_id': self.task_id,
             'status': self.status.value,
             'result': self.result,
             'error': self.error,
             'execution_time': self.execution_time,
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'started_at': started_at,
+            'completed_at': completed_at,
             'metadata': self.metadata
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationTask:
     """Automation task definition"""
     id: str
@@ -80,7 +96,7 @@ class AutomationTask:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapingSession:
     """Scraping session information"""
     session_id: str
@@ -96,6 +112,8 @@ class ScrapingSession:
     error_message: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=lambda: datetime.now())
+    # JSON encoding of config, filled on first use; config is not mutated after creation
+    config_json: Optional[str] = field(default=None, repr=False, compare=False)
 
     def duration_seconds(self) -> Optional[float]:
         """Calculate session duration in seconds"""
@@ -110,7 +128,7 @@ class ScrapingSession:
         return self.tenders_processed / self.tenders_found
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapingResult:
     """Result from a scraping operation"""
     session_id: str
@@ -135,7 +153,7 @@ class ScrapingResult:
         return len(self.data) > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationMetrics:
     """Automation system metrics"""
     tasks_created: int = 0
@@ -143,6 +161,7 @@ class AutomationMetrics:
     tasks_failed: int = 0
     tasks_retried: int = 0
     average_execution_time: float = 0.0
+    p95_execution_time: float = 0.0
     active_tasks: int = 0
     pending_tasks: int = 0
     retrying_tasks: int = 0
@@ -167,6 +186,7 @@ class AutomationMetrics:
             'tasks_failed': self.tasks_failed,
             'tasks_retried': self.tasks_retried,
             'average_execution_time': self.average_execution_time,
+            'p95_execution_time': self.p95_execution_time,
             'active_tasks': self.active_tasks,
             'pending_tasks': self.pending_tasks,
             'retrying_tasks': self.retrying_tasks,
@@ -176,12 +196,23 @@ class AutomationMetrics:
         }
 
 
-@dataclass
+# Checks every health run evaluates; they start out False until they pass. Checks that
+# can be skipped (resource usage without psutil, performance without task metrics) are
+# added only when they run, so a skipped check is absent rather than reported as failed.
+HEALTH_CHECK_NAMES = (
+    'task_service', 'session_service', 'active_tasks', 'failure_rate',
+    'retry_tasks', 'success_rate', 'sessions_exist', 'session_success_rate',
+    'resource_monitoring', 'performance'
+)
+
+
+@dataclass(slots=True)
 class HealthStatus:
     """System health status"""
     status: str  # "healthy", "degraded", "unhealthy"
-    checks: Dict[str, bool] = field(default_factory=dict)
+    checks: Dict[str, bool] = field(default_factory=lambda: dict.fromkeys(HEALTH_CHECK_NAMES, False))
     metrics: Optional[AutomationMetrics] = None
+    session_metrics: Optional[Dict[str, Any]] = None
     issues: List[str] = field(default_factory=list)
     timestamp: datetime = field(default_factory=lambda: datetime.now())
 
@@ -2,29 +2,283 @@
 Supabase Authentication Integration for VisionSeal
 Uses Supabase Auth for user management, registration, and JWT tokens
 """
+from __future__ import annotations
+
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, Hashable, Set, Coroutine, Callable
+from datetime import datetime, timezone
+import httpx
 import jwt
-from supabase import Client
+from postgrest.exceptions import APIError
+from supabase_auth import SyncGoTrueClient
+from supabase_auth.errors import AuthError, AuthApiError
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import logging
 
 from core.config.settings import settings
 from core.database.supabase_client import supabase_manager
 from core.logging.setup import get_logger
 
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Optional; without it each worker relies on its own in-process caches
+    redis_asyncio = None
+
 logger = get_logger("supabase_auth")
 security = HTTPBearer()
 
+# Anything shorter cannot be a Supabase access token
+MIN_TOKEN_LENGTH = 20
+BEARER_PREFIX = "bearer "
+
+# Verified tokens are trusted for at most this long (never past their exp) before they
+# are checked again; tokens verified locally stay valid until exp even if revoked
+TOKEN_CACHE_TTL = 30  # seconds
+TOKEN_CACHE_SIZE = 10000
+
+# Asymmetric algorithms Supabase signs access tokens with; HS256 tokens need the
+# project secret and are still verified remotely
+JWKS_ALGORITHMS = ("RS256", "ES256")
+JWKS_CACHE_LIFESPAN = 600  # seconds
+
+# Profiles change rarely; writes made through this module invalidate them immediately
+PROFILE_CACHE_TTL = 60  # seconds
+PROFILE_CACHE_SIZE = 5000
+
+# Logins by the same user within this window share one last_login write
+LAST_LOGIN_WRITE_INTERVAL = 30  # seconds
+
+# Keys in the cache shared between workers through Redis
+REDIS_TOKEN_PREFIX = b"auth:token:"
+REDIS_PROFILE_PREFIX = b"auth:profile:"
+REDIS_TIMEOUT = 0.25  # seconds; a slow cache must not hold up authentication
+
+# Transient Supabase failures worth another attempt, with exponential backoff plus jitter
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+# Refused before being processed, so safe to retry even for calls that are not idempotent;
+# a gateway error may arrive after the upstream call has already taken effect
+REJECTED_STATUSES = frozenset({429, 503})
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.05  # seconds
+RETRY_MAX_DELAY = 2.0  # seconds; a longer Retry-After fails the request instead of holding it
+
+# Supabase Auth error codes mapped to client-facing messages
+_REGISTRATION_ERRORS = {
+    "user_already_exists": "User already exists",
+    "email_exists": "User already exists",
+    "email_address_invalid": "Invalid email format",
+    "weak_password": "Password too weak",
+}
+_PASSWORD_UPDATE_ERRORS = {
+    "weak_password": "Password too weak",
+    "same_password": "New password must differ from the current one",
+}
+_EXPIRED_TOKEN_CODES = frozenset({"session_expired", "refresh_token_already_used"})
+_INVALID_TOKEN_CODES = frozenset({
+    "bad_jwt", "invalid_jwt", "session_not_found", "user_not_found", "refresh_token_not_found",
+    "no_authorization",
+})
+
+# Fallbacks for errors that carry no code (older Auth servers, non-Auth exceptions)
+_REGISTRATION_MESSAGES = (
+    (re.compile("already registered", re.I), "User already exists"),
+    (re.compile("invalid email", re.I), "Invalid email format"),
+    (re.compile("weak password", re.I), "Password too weak"),
+)
+_EXPIRED_MESSAGE = re.compile("expired", re.I)
+_INVALID_MESSAGE = re.compile("invalid", re.I)
+
+# Sign-up metadata copied into user_profiles, with the value used when a field is missing
+_PROFILE_KEYS = ("first_name", "last_name", "company", "phone", "sector", "address", "role")
+_PROFILE_DEFAULTS = {"first_name": "", "last_name": "", "role": "user"}
+
+
+class _TTLCache:
+    """Bounded LRU mapping whose entries expire after a per-entry TTL"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def _registration_error_detail(error: Exception) -> str:
+    """Client-facing reason a sign-up failed"""
+    detail = _REGISTRATION_ERRORS.get(getattr(error, "code", None))
+    if detail:
+        return detail
+    
+    message = getattr(error, "message", None) or str(error)
+    for pattern, detail in _REGISTRATION_MESSAGES:
+        if pattern.search(message):
+            return detail
+    return f"Registration failed: {message}"
+
+
+def _token_error_kind(error: Exception) -> Optional[str]:
+    """'expired' or 'invalid' when the error means the token was rejected, else None"""
+    if isinstance(error, AuthError) and error.code:
+        if error.code in _EXPIRED_TOKEN_CODES:
+            return "expired"
+        if error.code in _INVALID_TOKEN_CODES:
+            return "invalid"
+    if isinstance(error, AuthApiError) and error.status in (401, 403):
+        return "invalid"
+    
+    message = str(error)
+    if _EXPIRED_MESSAGE.search(message):
+        return "expired"
+    if _INVALID_MESSAGE.search(message):
+        return "invalid"
+    return None
+
+
+def _transient_status(error: Exception, retry_statuses: frozenset = RETRYABLE_STATUSES) -> Optional[int]:
+    """HTTP status of a failed Supabase call if it is worth retrying"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    elif isinstance(error, APIError):
+        status = error.code  # Numeric only when the gateway answered without a JSON body
+    else:
+        status = getattr(error, "status", None)
+    return status if status in retry_statuses else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Delay requested by the server's Retry-After header, when one is available"""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(error.response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _call_with_retry(func: Callable, *args: Any, retry_statuses: frozenset = RETRYABLE_STATUSES) -> Any:
+    """Run a blocking Supabase call in a worker thread, retrying rate limits and gateway errors"""
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            status = _transient_status(e, retry_statuses)
+            if status is None or attempt == RETRY_ATTEMPTS:
+                raise
+            
+            delay = _retry_after(e)
+            if delay is None:
+                delay = RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, RETRY_BASE_DELAY)
+            elif delay > RETRY_MAX_DELAY:
+                raise
+            logger.warning(f"⚠️ Supabase returned {status}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def _create_shared_cache():
+    """Redis client for the cross-worker cache, or None when Redis is not configured"""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_asyncio is None or not redis_url:
+        return None
+    
+    return redis_asyncio.Redis.from_url(
+        redis_url,
+        decode_responses=False,
+        max_connections=settings.redis.max_connections,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT
+    )
+
+
+def _json_default(value: Any) -> str:
+    """Encode datetimes from Supabase user objects the way FastAPI would"""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _unverified_claims(token: str) -> Dict[str, Any]:
+    """Token claims read without checking the signature; empty if the token is malformed"""
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def _token_ttl(token: str) -> float:
+    """Seconds until the token's exp claim, or 0 if it cannot be read"""
+    try:
+        return float(_unverified_claims(token)["exp"]) - time.time()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
 
 class SupabaseAuthManager:
-    """Manages authentication using Supabase Auth"""
+    """
+    Manages authentication using Supabase Auth.
+    
+    The Supabase clients are synchronous, so every network call is run with
+    asyncio.to_thread to keep the event loop free while it waits.
+    """
     
     def __init__(self):
         self.supabase = supabase_manager.get_client(use_service_key=False)
         self.service_client = supabase_manager.get_client(use_service_key=True)
+        # Truncated token hash -> (full hash, user fields); failures are never cached
+        self._token_cache = _TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+        
+        self._profile_cache = _TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+        # Users whose last_login was written recently
+        self._recent_logins = _TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=LAST_LOGIN_WRITE_INTERVAL)
+        # Bookkeeping writes running after their response was sent; kept so they are not collected
+        self._background_tasks: Set[asyncio.Task] = set()
+        # User id -> profile lookup in progress, shared by concurrent requests
+        self._profile_inflight: Dict[str, asyncio.Task] = {}
+        # Second cache level shared by all workers; None when Redis is not configured
+        self._shared_cache = _create_shared_cache()
+        
+        # Project signing keys for verifying tokens locally
+        supabase_url = os.getenv('SUPABASE_URL')
+        self._jwks_client = jwt.PyJWKClient(
+            f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            cache_keys=True,
+            lifespan=JWKS_CACHE_LIFESPAN
+        ) if supabase_url else None
         
     async def register_user(self, email: str, password: str, user_metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Register a new user with Supabase Auth"""
@@ -33,13 +287,13 @@ class SupabaseAuthManager:
             metadata = user_metadata or {}
             
             # Register with Supabase Auth
-            response = self.supabase.auth.sign_up({
+            response = await _call_with_retry(self.supabase.auth.sign_up, {
                 "email": email,
                 "password": password,
                 "options": {
                     "data": metadata
                 }
-            })
+            }, retry_statuses=REJECTED_STATUSES)
             
             if response.user:
                 logger.info(f"✅ User registered successfully: {email}")
@@ -61,26 +315,12 @@ class SupabaseAuthManager:
                 
         except Exception as e:
             logger.error(f"❌ Registration error: {str(e)}")
-            # Check if it's a Supabase auth error
-            if hasattr(e, 'message'):
-                error_msg = e.message
-            else:
-                error_msg = str(e)
-            
-            # More specific error handling
-            if "already registered" in error_msg.lower():
-                raise HTTPException(status_code=400, detail="User already exists")
-            elif "invalid email" in error_msg.lower():
-                raise HTTPException(status_code=400, detail="Invalid email format")
-            elif "weak password" in error_msg.lower():
-                raise HTTPException(status_code=400, detail="Password too weak")
-            else:
-                raise HTTPException(status_code=400, detail=f"Registration failed: {error_msg}")
+            raise HTTPException(status_code=400, detail=_registration_error_detail(e))
     
     async def login_user(self, email: str, password: str) -> Dict[str, Any]:
         """Login user with Supabase Auth"""
         try:
-            response = self.supabase.auth.sign_in_with_password({
+            response = await _call_with_retry(self.supabase.auth.sign_in_with_password, {
                 "email": email,
                 "password": password
             })
@@ -88,8 +328,8 @@ class SupabaseAuthManager:
             if response.user and response.session:
                 logger.info(f"✅ User logged in successfully: {email}")
                 
-                # Update last login
-                await self._update_last_login(response.user.id)
+                # Update last login without holding up the response
+                self._run_in_background(self._update_last_login(response.user.id))
                 
                 return {
                     "success": True,
@@ -117,18 +357,22 @@ class SupabaseAuthManager:
             if not token or len(token) < 20:
                 raise HTTPException(status_code=400, detail="Invalid token format")
             
+            # Forget cached verifications first so this token stops authenticating here
+            token_hash = hashlib.sha256(token.encode()).digest()
+            self._token_cache.pop(token_hash[:16])
+            self._shared_cache_delete(REDIS_TOKEN_PREFIX + token_hash)
+            
             # Get user info before logout for logging
             user_info = None
             try:
-                user_response = self.supabase.auth.get_user(token)
+                user_response = await asyncio.to_thread(self.supabase.auth.get_user, token)
                 if user_response.user:
                     user_info = user_response.user.email
             except:
                 pass  # User info is optional for logout
             
-            # Set the session token and sign out
-            self.supabase.auth.set_session(token, refresh_token=None)
-            response = self.supabase.auth.sign_out()
+            # Revoke by the token itself; the shared client's session belongs to no single request
+            await asyncio.to_thread(self.supabase.auth.admin.sign_out, token)
             
             logger.info(f"✅ User logged out successfully: {user_info or 'unknown'}")
             return {
@@ -153,14 +397,14 @@ class SupabaseAuthManager:
                 raise HTTPException(status_code=400, detail="Invalid refresh token format")
             
             # Attempt to refresh session
-            response = self.supabase.auth.refresh_session(refresh_token)
+            response = await asyncio.to_thread(self.supabase.auth.refresh_session, refresh_token)
             
             if response.session and response.session.access_token:
                 logger.info("✅ Token refreshed successfully")
                 
                 # Update last login for user
                 if response.user:
-                    await self._update_last_login(response.user.id)
+                    self._run_in_background(self._update_last_login(response.user.id))
                 
                 return {
                     "success": True,
@@ -177,10 +421,12 @@ class SupabaseAuthManager:
                     "error": "Invalid refresh token or session expired"
                 }
                 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"❌ Token refresh error: {str(e)}")
             # Distinguish between different error types
-            if "invalid" in str(e).lower() or "expired" in str(e).lower():
+            if _token_error_kind(e):
                 raise HTTPException(status_code=401, detail="Refresh token invalid or expired")
             else:
                 raise HTTPException(status_code=500, detail="Token refresh service unavailable")
@@ -188,7 +434,7 @@ class SupabaseAuthManager:
     async def verify_email(self, token: str) -> Dict[str, Any]:
         """Verify user email with token"""
         try:
-            response = self.supabase.auth.verify_otp({
+            response = await asyncio.to_thread(self.supabase.auth.verify_otp, {
                 "token": token,
                 "type": "signup"
             })
@@ -197,7 +443,7 @@ class SupabaseAuthManager:
                 logger.info(f"✅ Email verified successfully: {response.user.email}")
                 
                 # Update user profile verification status
-                await self._update_verification_status(response.user.id, True)
+                self._run_in_background(self._update_verification_status(response.user.id, True))
                 
                 return {
                     "success": True,
@@ -216,7 +462,7 @@ class SupabaseAuthManager:
     async def reset_password(self, email: str) -> Dict[str, Any]:
         """Send password reset email"""
         try:
-            response = self.supabase.auth.reset_password_email(email)
+            response = await asyncio.to_thread(self.supabase.auth.reset_password_email, email)
             
             logger.info(f"✅ Password reset email sent: {email}")
             return {
@@ -231,13 +477,18 @@ class SupabaseAuthManager:
     async def update_password(self, token: str, new_password: str) -> Dict[str, Any]:
         """Update user password with reset token"""
         try:
-            # Set the session token
-            self.supabase.auth.set_session(token, refresh_token=None)
+            def set_password():
+                # A private client, so concurrent logins cannot swap the session in between
+                auth_client = self._user_auth_client()
+                # No refresh token: an expired reset token fails rather than being renewed
+                auth_client.set_session(token, refresh_token="")
+                
+                # Update password
+                return auth_client.update_user({
+                    "password": new_password
+                })
             
-            # Update password
-            response = self.supabase.auth.update_user({
-                "password": new_password
-            })
+            response = await asyncio.to_thread(set_password)
             
             if response.user:
                 logger.info(f"✅ Password updated successfully: {response.user.email}")
@@ -253,43 +504,71 @@ class SupabaseAuthManager:
                 
         except Exception as e:
             logger.error(f"❌ Password update error: {str(e)}")
-            raise HTTPException(status_code=400, detail="Password update failed")
+            detail = _PASSWORD_UPDATE_ERRORS.get(getattr(e, "code", None), "Password update failed")
+            raise HTTPException(status_code=400, detail=detail)
+    
+    def _user_auth_client(self) -> SyncGoTrueClient:
+        """
+        Auth client holding a single user's session.
+        
+        The shared client stores whichever session was set last, and calls from other
+        requests run concurrently in worker threads, so per-user session calls get their own.
+        """
+        return SyncGoTrueClient(
+            url=self.supabase.auth_url,
+            headers=dict(self.supabase.options.headers),
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=supabase_manager.http_client
+        )
     
     async def get_current_user(self, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
         """Get current user from JWT token"""
+        if not credentials or not credentials.credentials:
+            raise HTTPException(status_code=401, detail="Missing authentication token")
+        
+        return await self.authenticate(credentials.credentials)
+    
+    async def get_account_details(self, token: str) -> Dict[str, Any]:
+        """
+        Account fields that access tokens do not carry, read from Supabase Auth.
+        
+        Authentication returns only what a token can vouch for, so locally and remotely
+        verified users look the same; endpoints that show these fields fetch them here.
+        """
+        response = await asyncio.to_thread(self.supabase.auth.get_user, token)
+        if not response.user:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        
+        return {
+            "email_verified": response.user.email_confirmed_at is not None,
+            "created_at": response.user.created_at,
+            "last_sign_in": response.user.last_sign_in_at,
+        }
+    
+    async def authenticate(self, token: str) -> Dict[str, Any]:
+        """Resolve a bearer token to the current user, raising HTTPException if it is rejected"""
         try:
-            if not credentials or not credentials.credentials:
-                raise HTTPException(status_code=401, detail="Missing authentication token")
-            
-            token = credentials.credentials
-            
             # Validate token format
-            if not token or len(token) < 20:
+            if not token or len(token) < MIN_TOKEN_LENGTH:
                 raise HTTPException(status_code=401, detail="Invalid token format")
             
-            # Verify token with Supabase
-            response = self.supabase.auth.get_user(token)
+            # Hashed once here; every cache layer keys on this digest
+            token_hash = hashlib.sha256(token.encode()).digest()
+            user_info = await self._verify_token(token, token_hash)
             
-            if response.user:
-                # Check if user is still active
-                user_profile = await self._get_user_profile(response.user.id)
-                
-                # Verify user account is active
-                if user_profile and user_profile.get("status") == "suspended":
-                    raise HTTPException(status_code=403, detail="Account suspended")
-                
-                return {
-                    "user_id": response.user.id,
-                    "email": response.user.email,
-                    "email_verified": response.user.email_confirmed_at is not None,
-                    "created_at": response.user.created_at,
-                    "last_sign_in": response.user.last_sign_in_at,
-                    "user_metadata": response.user.user_metadata,
-                    "profile": user_profile,
-                    "is_active": user_profile.get("status", "active") == "active" if user_profile else True
-                }
-            else:
-                raise HTTPException(status_code=401, detail="Invalid or expired token")
+            # Check if user is still active
+            user_profile = await self._get_user_profile(user_info["user_id"])
+            
+            # Verify user account is active
+            if user_profile and user_profile.get("status") == "suspended":
+                raise HTTPException(status_code=403, detail="Account suspended")
+            
+            return {
+                **user_info,
+                "profile": user_profile,
+                "is_active": user_profile.get("status", "active") == "active" if user_profile else True
+            }
                 
         except HTTPException:
             # Re-raise HTTP exceptions as-is
@@ -297,47 +576,221 @@ class SupabaseAuthManager:
         except Exception as e:
             logger.error(f"❌ Get current user error: {str(e)}")
             # Distinguish between different error types
-            if "expired" in str(e).lower():
+            error_kind = _token_error_kind(e)
+            if error_kind == "expired":
                 raise HTTPException(status_code=401, detail="Token expired")
-            elif "invalid" in str(e).lower():
+            elif error_kind == "invalid":
                 raise HTTPException(status_code=401, detail="Invalid token")
             else:
                 raise HTTPException(status_code=500, detail="Authentication service unavailable")
     
+    async def _verify_token(self, token: str, token_hash: bytes) -> Dict[str, Any]:
+        """Verify a token, reusing recent successful verifications"""
+        key = token_hash[:16]
+        cached = self._token_cache.get(key)
+        # The key is a truncated digest, so confirm the full digest before trusting the entry
+        if cached is not None and hmac.compare_digest(cached[0], token_hash):
+            return cached[1]
+        
+        # Never trust a cached entry past the token's own expiry
+        ttl = min(_token_ttl(token), TOKEN_CACHE_TTL)
+        
+        # Another worker may have verified this token already; the full digest is its key
+        user_info = await self._shared_cache_get(REDIS_TOKEN_PREFIX + token_hash)
+        if user_info is None:
+            # Key lookups may fetch the JWKS, so both paths run off the event loop
+            user_info = await asyncio.to_thread(self._verify_token_locally, token)
+            if user_info is None:
+                user_info = await self._verify_token_remotely_with_profile(token)
+            self._shared_cache_set(REDIS_TOKEN_PREFIX + token_hash, user_info, ttl)
+        
+        self._token_cache.set(key, (token_hash, user_info), ttl=ttl)
+        return user_info
+    
+    async def _verify_token_remotely_with_profile(self, token: str) -> Dict[str, Any]:
+        """
+        Ask Supabase to verify the token while the profile of its claimed user loads.
+        
+        The subject is read without checking the signature, so the lookup started
+        here is abandoned if verification fails.
+        """
+        user_id = _unverified_claims(token).get("sub")
+        prefetch = None
+        if isinstance(user_id, str) and user_id not in self._profile_inflight and self._profile_cache.get(user_id) is None:
+            prefetch = self._start_profile_lookup(user_id)
+        
+        try:
+            return await asyncio.to_thread(self._verify_token_remotely, token)
+        except BaseException:
+            if prefetch is not None and not prefetch.done():
+                if self._profile_inflight.get(user_id) is prefetch:
+                    self._profile_inflight.pop(user_id)
+                prefetch.cancel()
+            raise
+    
+    async def _shared_cache_get(self, key: bytes) -> Optional[Any]:
+        """Read from the shared cache; any Redis failure counts as a miss"""
+        if self._shared_cache is None:
+            return None
+        
+        try:
+            raw = await self._shared_cache.get(key)
+        except Exception as e:
+            logger.debug(f"Shared auth cache read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+    
+    def _shared_cache_set(self, key: bytes, value: Any, ttl: float) -> None:
+        """Write to the shared cache in the background"""
+        if self._shared_cache is None or ttl <= 0:
+            return
+        
+        async def write():
+            try:
+                await self._shared_cache.set(key, json.dumps(value, default=_json_default), px=int(ttl * 1000))
+            except Exception as e:
+                logger.debug(f"Shared auth cache write failed: {e}")
+        
+        self._run_in_background(write())
+    
+    def _shared_cache_delete(self, key: bytes) -> None:
+        """Remove an entry from the shared cache in the background"""
+        if self._shared_cache is None:
+            return
+        
+        async def delete():
+            try:
+                await self._shared_cache.delete(key)
+            except Exception as e:
+                logger.debug(f"Shared auth cache delete failed: {e}")
+        
+        self._run_in_background(delete())
+    
+    def _verify_token_locally(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify the token signature against the project's JWKS.
+        
+        Returns None when the token cannot be checked locally (symmetric algorithm,
+        unknown key id or JWKS unavailable) so the caller falls back to Supabase.
+        """
+        if self._jwks_client is None:
+            return None
+        
+        try:
+            algorithm = jwt.get_unverified_header(token).get("alg")
+            if algorithm not in JWKS_ALGORITHMS:
+                return None
+            signing_key = self._jwks_client.get_signing_key_from_jwt(token)
+        except (jwt.DecodeError, jwt.PyJWKClientError) as e:
+            logger.debug(f"Local token verification unavailable: {e}")
+            return None
+        
+        try:
+            payload = jwt.decode(
+                token,
+                signing_key.key,
+                algorithms=[algorithm],
+                audience="authenticated",
+                options={"require": ["exp", "sub"]}
+            )
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Token expired")
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        return {
+            "user_id": payload["sub"],
+            "email": payload.get("email"),
+            "user_metadata": payload.get("user_metadata") or {},
+        }
+    
+    def _verify_token_remotely(self, token: str) -> Dict[str, Any]:
+        """Verify the token with Supabase Auth, returning the same fields as a local check"""
+        response = self.supabase.auth.get_user(token)
+        if not response.user:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        
+        return {
+            "user_id": response.user.id,
+            "email": response.user.email,
+            "user_metadata": response.user.user_metadata,
+        }
+    
     async def _create_user_profile(self, user, metadata: Dict):
         """Create user profile in custom table"""
         try:
-            profile_data = {
-                "id": user.id,
-                "email": user.email,
-                "first_name": metadata.get("first_name", ""),
-                "last_name": metadata.get("last_name", ""),
-                "company": metadata.get("company"),
-                "phone": metadata.get("phone"),
-                "sector": metadata.get("sector"),
-                "address": metadata.get("address"),
-                "role": metadata.get("role", "user"),
-                "status": "pending_verification",
-                "preferences": metadata.get("preferences", {})
-            }
+            profile_data = {key: metadata.get(key, _PROFILE_DEFAULTS.get(key)) for key in _PROFILE_KEYS}
+            profile_data.update(
+                id=user.id,
+                email=user.email,
+                status="pending_verification",
+                preferences=metadata.get("preferences", {})
+            )
             
-            response = self.service_client.table('user_profiles').insert(profile_data).execute()
-            logger.info(f"✅ User profile created: {user.email}")
+            # Upsert so a profile left over from an earlier attempt is overwritten in the same request
+            response = await asyncio.to_thread(
+                self.service_client.table('user_profiles').upsert(profile_data, on_conflict='id').execute
+            )
+            self._invalidate_profile(user.id)
+            logger.info(f"✅ User profile saved: {user.email}")
             
         except Exception as e:
             logger.error(f"❌ Failed to create user profile: {str(e)}")
-            # Try to update existing profile if insert failed
-            try:
-                update_response = self.service_client.table('user_profiles').update(profile_data).eq('id', user.id).execute()
-                logger.info(f"✅ User profile updated: {user.email}")
-            except Exception as update_error:
-                logger.error(f"❌ Failed to update user profile: {str(update_error)}")
-                raise e
+            raise
     
     async def _get_user_profile(self, user_id: str) -> Optional[Dict]:
+        """Get user profile, joining a lookup already running for the same user"""
+        profile = self._profile_cache.get(user_id)
+        if profile is not None:
+            return profile
+        
+        task = self._profile_inflight.get(user_id) or self._start_profile_lookup(user_id)
+        try:
+            # Shielded so one cancelled request does not abort the lookup for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # A prefetch abandoned after a failed token check; this request was not cancelled
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                return await self._get_user_profile(user_id)
+            raise
+    
+    def _start_profile_lookup(self, user_id: str) -> asyncio.Task:
+        """Start a profile lookup that concurrent requests for the same user can join"""
+        task = asyncio.ensure_future(self._load_user_profile(user_id))
+        self._profile_inflight[user_id] = task
+        
+        def finished(done: asyncio.Task) -> None:
+            # A detached lookup must not remove the one that replaced it
+            if self._profile_inflight.get(user_id) is done:
+                del self._profile_inflight[user_id]
+        
+        task.add_done_callback(finished)
+        return task
+    
+    async def _load_user_profile(self, user_id: str) -> Optional[Dict]:
+        """Fetch a profile and cache it unless a write invalidated the lookup meanwhile"""
+        shared_key = REDIS_PROFILE_PREFIX + user_id.encode()
+        profile = await self._shared_cache_get(shared_key)
+        from_shared_cache = profile is not None
+        if not from_shared_cache:
+            profile = await self._fetch_user_profile(user_id)
+        
+        if profile is not None and self._profile_inflight.get(user_id) is asyncio.current_task():
+            self._profile_cache.set(user_id, profile)
+            if not from_shared_cache:
+                self._shared_cache_set(shared_key, profile, PROFILE_CACHE_TTL)
+        return profile
+    
+    def _invalidate_profile(self, user_id: str) -> None:
+        """Drop the cached profile and detach any lookup that may have read old data"""
+        self._profile_cache.pop(user_id)
+        self._profile_inflight.pop(user_id, None)
+        self._shared_cache_delete(REDIS_PROFILE_PREFIX + user_id.encode())
+    
+    async def _fetch_user_profile(self, user_id: str) -> Optional[Dict]:
         """Get user profile from custom table"""
         try:
-            response = self.service_client.table('user_profiles').select('*').eq('id', user_id).execute()
+            response = await _call_with_retry(self.service_client.table('user_profiles').select('*').eq('id', user_id).execute)
             
             if response.data:
                 return response.data[0]
@@ -347,49 +800,74 @@ class SupabaseAuthManager:
             logger.error(f"❌ Failed to get user profile: {str(e)}")
             return None
     
+    def _run_in_background(self, coro: Coroutine) -> None:
+        """Schedule a write that the caller does not need to wait for"""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
     async def _update_last_login(self, user_id: str):
-        """Update user's last login timestamp"""
+        """Update user's last login timestamp, at most once per write interval"""
+        if self._recent_logins.get(user_id):
+            return
+        self._recent_logins.set(user_id, True)
+        
         try:
-            response = self.service_client.table('user_profiles').update({
-                "last_login": datetime.utcnow().isoformat()
-            }).eq('id', user_id).execute()
+            await asyncio.to_thread(self.service_client.table('user_profiles').update({
+                "last_login": datetime.now(timezone.utc).isoformat(timespec="seconds")
+            }).eq('id', user_id).execute)
+            self._invalidate_profile(user_id)
             
         except Exception as e:
+            # Let the next login try again instead of skipping writes for the whole interval
+            self._recent_logins.pop(user_id)
             logger.error(f"❌ Failed to update last login: {str(e)}")
     
     async def _update_verification_status(self, user_id: str, verified: bool):
         """Update user email verification status"""
         try:
-            response = self.service_client.table('user_profiles').update({
+            response = await asyncio.to_thread(self.service_client.table('user_profiles').update({
                 "is_verified": verified,
                 "status": "active" if verified else "pending_verification"
-            }).eq('id', user_id).execute()
+            }).eq('id', user_id).execute)
+            self._invalidate_profile(user_id)
             
         except Exception as e:
             logger.error(f"❌ Failed to update verification status: {str(e)}")
 
 
-# Global auth manager instance
-auth_manager = SupabaseAuthManager()
+@lru_cache(maxsize=1)
+def get_auth_manager() -> SupabaseAuthManager:
+    """Shared auth manager, created on first use rather than at import"""
+    return SupabaseAuthManager()
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from core.auth.supabase_auth import auth_manager` working without eager construction
+    if name == "auth_manager":
+        return get_auth_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Dependency for getting current user
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """FastAPI dependency to get current authenticated user"""
-    return await auth_manager.get_current_user(credentials)
+    return await get_auth_manager().get_current_user(credentials)
 
 
 # Optional authentication (for endpoints that work with or without auth)
 async def get_current_user_optional(request: Request) -> Optional[Dict[str, Any]]:
     """Optional authentication dependency"""
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or auth_header[:7].lower() != BEARER_PREFIX:
+        return None
+    
+    # Obviously malformed tokens are treated as anonymous without a verification attempt
+    token = auth_header[7:]
+    if len(token) < MIN_TOKEN_LENGTH:
+        return None
+    
     try:
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return None
-        
-        token = auth_header.replace("Bearer ", "")
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        
-        return await auth_manager.get_current_user(credentials)
-    except:
+        return await get_auth_manager().authenticate(token)
+    except HTTPException:
         return None
\ No newline at end of file
@@ -4,21 +4,74 @@ Configuration Management CLI for VisionSeal
 Provides command-line interface for managing automation configurations
 """
 import argparse
-import json
+import os
 import sys
 from pathlib import Path
 from typing import Dict, Any
 
-from core.config.manager import config_manager, ConfigurationError
-from core.logging.setup import get_logger
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
 
-logger = get_logger("config_cli")
+# Output formatting is fixed, so it is configured once rather than on every dump
+if HAS_ORJSON:
+    _ORJSON_OPTION = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+else:
+    _json_encode = json.JSONEncoder(indent=2, default=str).encode
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON read from a file opened in binary mode"""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _load_json(path: Path) -> Any:
+    """Read and parse a JSON file in one read"""
+    return _loads(path.read_bytes())
+
+
+def _emit_json(obj: Any):
+    """Write a configuration to stdout as pretty-printed JSON without a str round-trip"""
+    if HAS_ORJSON:
+        data = orjson.dumps(obj, option=_ORJSON_OPTION, default=str)
+    else:
+        data = _json_encode(obj).encode()
+    
+    stream = getattr(sys.stdout, 'buffer', None)
+    if stream is None:
+        # Replaced stdout (e.g. captured output) only accepts text
+        print(data.decode())
+        return
+    
+    # Text already printed is still buffered in the wrapper and must come out first
+    sys.stdout.flush()
+    stream.write(data)
+    stream.write(b"\n")
+    stream.flush()
+
+
+# Interactive profile settings: (key, prompt, parser); a parser returning None leaves the key unset
+_BASIC_SETTINGS_PROMPTS = (
+    ('max_pages', "Max pages (default: 10): ", int),
+    ('headless', "Headless mode (y/N): ", lambda answer: True if answer.lower() == 'y' else None),
+    ('request_delay', "Request delay in seconds (default: 2): ", int),
+    ('timeout', "Timeout in seconds (default: 30): ", int),
+)
+_ADVANCED_SETTINGS_PROMPTS = (
+    ('priority_countries', "Priority countries (comma-separated): ", lambda answer: [c.strip() for c in answer.split(',')]),
+    ('min_relevance_score', "Minimum relevance score (0-100): ", float),
+)
 
 
 class ConfigCLI:
     """Command-line interface for configuration management"""
     
     def __init__(self):
+        # Imported here so argument errors and --help never load the configuration stack
+        from core.config.manager import config_manager
         self.config_manager = config_manager
     
     def list_profiles(self):
@@ -30,31 +83,32 @@ class ConfigCLI:
                 print("📝 No profiles found")
                 return
             
-            print("\n📋 Available Profiles:")
-            print("=" * 60)
+            # Assembled first and written once rather than printed line by line
+            parts = ["\n📋 Available Profiles:\n", "=" * 60, "\n"]
             
             for name, profile in profiles.items():
-                print(f"\n🔹 {name}")
-                print(f"   Description: {profile.get('description', 'No description')}")
+                parts.append(f"\n🔹 {name}\n")
+                parts.append(f"   Description: {profile.get('description', 'No description')}\n")
                 
                 settings = profile.get('settings', {})
                 if settings:
-                    print("   Settings:")
-                    for key, value in settings.items():
-                        print(f"     - {key}: {value}")
+                    parts.append("   Settings:\n")
+                    parts.extend(f"     - {key}: {value}\n" for key, value in settings.items())
                 
                 created_at = profile.get('created_at')
                 if created_at:
-                    print(f"   Created: {created_at}")
+                    parts.append(f"   Created: {created_at}\n")
             
-            print("=" * 60)
-            print(f"Total profiles: {len(profiles)}")
+            parts.extend(("=" * 60, "\n", f"Total profiles: {len(profiles)}\n"))
+            sys.stdout.write("".join(parts))
             
         except Exception as e:
             print(f"❌ Error listing profiles: {str(e)}")
     
     def show_profile(self, name: str):
         """Show detailed profile information"""
+        from core.config.manager import ConfigurationError
+        
         try:
             profile = self.config_manager.get_profile_config(name)
             
@@ -69,7 +123,7 @@ class ConfigCLI:
             settings = profile.get('settings', {})
             if settings:
                 print("\nSettings:")
-                print(json.dumps(settings, indent=2))
+                _emit_json(settings)
             
         except ConfigurationError as e:
             print(f"❌ {str(e)}")
@@ -82,8 +136,7 @@ class ConfigCLI:
             settings = {}
             
             if settings_file and settings_file.exists():
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
+                settings = _load_json(settings_file)
             else:
                 # Interactive settings creation
                 settings = self._interactive_settings_creation()
@@ -96,6 +149,8 @@ class ConfigCLI:
     
     def delete_profile(self, name: str):
         """Delete a profile"""
+        from core.config.manager import ConfigurationError
+        
         try:
             # Confirm deletion
             confirm = input(f"Are you sure you want to delete profile '{name}'? (y/N): ")
@@ -122,7 +177,7 @@ class ConfigCLI:
                 print("\n⚙️  Full Automation Configuration")
             
             print("=" * 50)
-            print(json.dumps(config, indent=2, default=str))
+            _emit_json(config)
             
         except Exception as e:
             print(f"❌ Error showing automation config: {str(e)}")
@@ -130,13 +185,12 @@ class ConfigCLI:
     def update_automation_config(self, scraper: str, config_file: Path):
         """Update automation configuration for a scraper"""
         try:
-            if not config_file.exists():
+            try:
+                new_config = _load_json(config_file)
+            except FileNotFoundError:
                 print(f"❌ Configuration file not found: {config_file}")
                 return
             
-            with open(config_file, 'r') as f:
-                new_config = json.load(f)
-            
             # Validate configuration
             if not self.config_manager.validate_config(new_config):
                 print("❌ Configuration validation failed")
@@ -153,8 +207,7 @@ class ConfigCLI:
         try:
             overrides = {}
             if overrides_file and overrides_file.exists():
-                with open(overrides_file, 'r') as f:
-                    overrides = json.load(f)
+                overrides = _load_json(overrides_file)
             
             merged_config = self.config_manager.get_merged_config(
                 scraper=scraper,
@@ -169,7 +222,7 @@ class ConfigCLI:
                 print(f"   Overrides: Applied from {overrides_file}")
             
             print("=" * 50)
-            print(json.dumps(merged_config, indent=2, default=str))
+            _emit_json(merged_config)
             
         except Exception as e:
             print(f"❌ Error showing merged config: {str(e)}")
@@ -205,13 +258,12 @@ class ConfigCLI:
     def set_overrides(self, overrides_file: Path):
         """Set global configuration overrides"""
         try:
-            if not overrides_file.exists():
+            try:
+                overrides = _load_json(overrides_file)
+            except FileNotFoundError:
                 print(f"❌ Overrides file not found: {overrides_file}")
                 return
             
-            with open(overrides_file, 'r') as f:
-                overrides = json.load(f)
-            
             self.config_manager.set_overrides(overrides)
             print("✅ Set global configuration overrides")
             
@@ -224,50 +276,27 @@ class ConfigCLI:
         print("Press Enter to use default values")
         
         settings = {}
+        self._prompt_settings(_BASIC_SETTINGS_PROMPTS, settings)
         
-        # Basic settings
-        max_pages = input("Max pages (default: 10): ").strip()
-        if max_pages:
-            settings['max_pages'] = int(max_pages)
-        
-        headless = input("Headless mode (y/N): ").strip().lower()
-        if headless == 'y':
-            settings['headless'] = True
-        
-        request_delay = input("Request delay in seconds (default: 2): ").strip()
-        if request_delay:
-            settings['request_delay'] = int(request_delay)
-        
-        timeout = input("Timeout in seconds (default: 30): ").strip()
-        if timeout:
-            settings['timeout'] = int(timeout)
-        
-        # Advanced settings
         print("\n🔧 Advanced Settings (optional)")
-        
-        priority_countries = input("Priority countries (comma-separated): ").strip()
-        if priority_countries:
-            settings['priority_countries'] = [c.strip() for c in priority_countries.split(',')]
-        
-        min_relevance = input("Minimum relevance score (0-100): ").strip()
-        if min_relevance:
-            settings['min_relevance_score'] = float(min_relevance)
+        self._prompt_settings(_ADVANCED_SETTINGS_PROMPTS, settings)
         
         return settings
+    
+    @staticmethod
+    def _prompt_settings(prompts, settings: Dict[str, Any]):
+        """Ask for each setting in turn, keeping only answered ones"""
+        for key, prompt, parse in prompts:
+            answer = input(prompt).strip()
+            if answer:
+                value = parse(answer)
+                if value is not None:
+                    settings[key] = value
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        description="VisionSeal Configuration Management CLI",
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # Profiles commands
-    profiles_parser = subparsers.add_parser('profiles', help='Profile management')
-    profiles_subparsers = profiles_parser.add_subparsers(dest='profiles_action')
+def _build_profiles_parser(parser: argparse.ArgumentParser):
+    """Profile management commands"""
+    profiles_subparsers = parser.add_subparsers(dest='profiles_action')
     
     # List profiles
     profiles_subparsers.add_parser('list', help='List all profiles')
@@ -285,10 +314,11 @@ def main():
     # Delete profile
     delete_profile_parser = profiles_subparsers.add_parser('delete', help='Delete profile')
     delete_profile_parser.add_argument('name', help='Profile name')
-    
-    # Automation config commands
-    automation_parser = subparsers.add_parser('automation', help='Automation configuration')
-    automation_subparsers = automation_parser.add_subparsers(dest='automation_action')
+
+
+def _build_automation_parser(parser: argparse.ArgumentParser):
+    """Automation config commands"""
+    automation_subparsers = parser.add_subparsers(dest='automation_action')
     
     # Show automation config
     show_auto_parser = automation_subparsers.add_parser('show', help='Show automation config')
@@ -298,30 +328,84 @@ def main():
     update_auto_parser = automation_subparsers.add_parser('update', help='Update automation config')
     update_auto_parser.add_argument('scraper', choices=['ungm', 'tunipages'], help='Scraper to update')
     update_auto_parser.add_argument('config_file', type=Path, help='JSON configuration file')
+
+
+def _build_merged_parser(parser: argparse.ArgumentParser):
+    """Merged config command"""
+    parser.add_argument('scraper', choices=['ungm', 'tunipages'], help='Scraper')
+    parser.add_argument('--profile', help='Profile name')
+    parser.add_argument('--overrides', type=Path, help='Overrides file')
+
+
+def _build_export_parser(parser: argparse.ArgumentParser):
+    """Export command"""
+    parser.add_argument('output_file', type=Path, help='Output file')
+
+
+def _build_import_parser(parser: argparse.ArgumentParser):
+    """Import command"""
+    parser.add_argument('input_file', type=Path, help='Input file')
+
+
+def _build_overrides_parser(parser: argparse.ArgumentParser):
+    """Overrides command"""
+    parser.add_argument('overrides_file', type=Path, help='Overrides JSON file')
+
+
+# Command name -> (help, parser builder); only the invoked command's parser is built
+_COMMANDS = {
+    'profiles': ('Profile management', _build_profiles_parser),
+    'automation': ('Automation configuration', _build_automation_parser),
+    'merged': ('Show merged configuration', _build_merged_parser),
+    'export': ('Export configuration', _build_export_parser),
+    'import': ('Import configuration', _build_import_parser),
+    'overrides': ('Set global overrides', _build_overrides_parser),
+}
+_COMMANDS_HELP = "commands:\n" + "\n".join(f"  {name:<12}{help_text}" for name, (help_text, _) in _COMMANDS.items())
+
+# Top-level help, printed without building a parser; kept identical to what argparse renders
+_USAGE = """usage: {prog} [-h] command ...
+
+VisionSeal Configuration Management CLI
+
+positional arguments:
+  command     Command to run
+
+options:
+  -h, --help  show this help message and exit
+
+""" + _COMMANDS_HELP + "\n"
+
+
+def main():
+    """Main CLI entry point"""
+    argv = sys.argv[1:]
     
-    # Merged config
-    merged_parser = subparsers.add_parser('merged', help='Show merged configuration')
-    merged_parser.add_argument('scraper', choices=['ungm', 'tunipages'], help='Scraper')
-    merged_parser.add_argument('--profile', help='Profile name')
-    merged_parser.add_argument('--overrides', type=Path, help='Overrides file')
-    
-    # Export/Import
-    export_parser = subparsers.add_parser('export', help='Export configuration')
-    export_parser.add_argument('output_file', type=Path, help='Output file')
-    
-    import_parser = subparsers.add_parser('import', help='Import configuration')
-    import_parser.add_argument('input_file', type=Path, help='Input file')
+    # Bare invocations and top-level --help need no parser at all
+    if not argv or argv[0] in ('-h', '--help'):
+        sys.stdout.write(_USAGE.format(prog=os.path.basename(sys.argv[0])))
+        return
     
-    # Overrides
-    overrides_parser = subparsers.add_parser('overrides', help='Set global overrides')
-    overrides_parser.add_argument('overrides_file', type=Path, help='Overrides JSON file')
+    parser = argparse.ArgumentParser(
+        description="VisionSeal Configuration Management CLI",
+        usage="%(prog)s [-h] command ...",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_COMMANDS_HELP
+    )
+    parser.add_argument('command', nargs='?', choices=_COMMANDS, metavar='command', help='Command to run')
     
-    args = parser.parse_args()
+    # The top-level parser only takes the command name; everything after it goes to that command
+    args = parser.parse_args(argv[:1])
     
     if not args.command:
         parser.print_help()
         return
     
+    help_text, build_command_parser = _COMMANDS[args.command]
+    command_parser = argparse.ArgumentParser(prog=f"{parser.prog} {args.command}", description=help_text)
+    build_command_parser(command_parser)
+    args = command_parser.parse_args(argv[1:], namespace=args)
+    
     cli = ConfigCLI()
     
     try:
@@ -335,7 +419,7 @@ def main():
             elif args.profiles_action == 'delete':
                 cli.delete_profile(args.name)
             else:
-                profiles_parser.print_help()
+                command_parser.print_help()
         
         elif args.command == 'automation':
             if args.automation_action == 'show':
@@ -343,7 +427,7 @@ def main():
             elif args.automation_action == 'update':
                 cli.update_automation_config(args.scraper, args.config_file)
             else:
-                automation_parser.print_help()
+                command_parser.print_help()
         
         elif args.command == 'merged':
             cli.show_merged_config(args.scraper, args.profile, args.overrides)
@@ -2,24 +2,186 @@
 Configuration Manager for VisionSeal
 Provides dynamic configuration management, validation, and hot-reload capabilities
 """
+import copy
 import os
 import json
+import time
 try:
     import yaml
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+from functools import cached_property
 from typing import Dict, Any, Optional, Union, List
 from pathlib import Path
 from datetime import datetime
 import logging
 
-from pydantic import ValidationError
+from pydantic import ConfigDict, ValidationError, create_model
 from core.config.settings import settings, AutomationSettings
 from core.logging.setup import get_logger
 
 logger = get_logger("config_manager")
 
+# Written to config/ when the files do not exist yet; copied before use since the
+# in-memory config is modified in place
+_DEFAULT_AUTOMATION_CONFIG = {
+    "scrapers": {
+        "ungm": {
+            "enabled": True,
+            "max_pages": 10,
+            "request_delay": 2,
+            "timeout": 30,
+            "retry_attempts": 3,
+            "priority_keywords": [
+                "consulting", "conseil", "advisory", "technical assistance",
+                "capacity building", "training", "formation", "étude"
+            ],
+            "target_countries": [
+                # North Africa
+                "Tunisia", "Morocco", "Algeria", "Egypt", "Libya", "Sudan",
+                
+                # West Africa  
+                "Nigeria", "Ghana", "Senegal", "Mali", "Burkina Faso", "Niger",
+                "Guinea", "Sierra Leone", "Liberia", "Ivory Coast", "Benin", "Togo",
+                
+                # East Africa
+                "Kenya", "Ethiopia", "Tanzania", "Uganda", "Rwanda", "Burundi",
+                "Somalia", "Madagascar", "Mauritius",
+                
+                # Central Africa
+                "Democratic Republic of Congo", "Congo", "Cameroon", "Chad", "Gabon",
+                "Central African Republic",
+                
+                # Southern Africa
+                "South Africa", "Botswana", "Namibia", "Zimbabwe", "Zambia",
+                "Angola", "Mozambique", "Malawi", "Lesotho"
+            ]
+        },
+        "tunipages": {
+            "enabled": True,
+            "max_pages": 10,
+            "request_delay": 2,
+            "timeout": 30,
+            "retry_attempts": 3,
+            "priority_keywords": [
+                "consulting", "conseil", "management", "étude",
+                "formation", "expertise", "audit", "strategy"
+            ],
+            "focus_regions": ["Africa", "African Continent", "Sub-Saharan Africa", "North Africa"]
+        }
+    },
+    "task_manager": {
+        "max_workers": 4,
+        "scheduler_interval": 30,
+        "cleanup_interval": 3600,
+        "max_retry_attempts": 3,
+        "retry_delay": 300,
+        "task_timeout": 3600
+    },
+    "performance": {
+        "max_concurrent_scrapers": 2,
+        "memory_threshold_mb": 1024,
+        "cpu_threshold_percent": 80,
+        "disk_threshold_percent": 85
+    },
+    "monitoring": {
+        "enable_metrics": True,
+        "metrics_retention_days": 30,
+        "alert_failure_threshold": 0.5,
+        "health_check_interval": 60
+    }
+}
+
+_DEFAULT_PROFILES = {
+    "topaza_africa": {
+        "name": "Topaza Africa Focus", 
+        "description": "Optimized for Topaza.net business across Africa",
+        "settings": {
+            "max_pages": 20,
+            "priority_countries": [
+                "Nigeria", "South Africa", "Kenya", "Ghana", "Egypt", 
+                "Morocco", "Tunisia", "Algeria", "Ethiopia", "Tanzania"
+            ],
+            "priority_sectors": [
+                "management consulting", "business development",
+                "training", "technical studies", "digital transformation"
+            ],
+            "min_relevance_score": 30.0,
+            "urgent_deadline_days": 10
+        }
+    },
+    "development": {
+        "name": "Development Profile",
+        "description": "Fast testing with limited scope",
+        "settings": {
+            "max_pages": 2,
+            "headless": False,
+            "request_delay": 1,
+            "timeout": 15
+        }
+    },
+    "production": {
+        "name": "Production Profile",
+        "description": "Full-scale production scraping",
+        "settings": {
+            "max_pages": 50,
+            "headless": True,
+            "request_delay": 3,
+            "timeout": 60,
+            "enable_monitoring": True
+        }
+    }
+}
+
+# Config file mtimes are rescanned at most this often; edits show up within this window
+MTIME_SCAN_INTERVAL = 1.0  # seconds
+
+
+def _read_json(file_path: Path) -> Any:
+    """Parse a JSON config file"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+# AutomationSettings with every field optional and no environment lookup: config files
+# carry partial scraper settings, so only the types of the fields present are checked
+_PartialAutomationSettings = create_model(
+    '_PartialAutomationSettings',
+    __config__=ConfigDict(extra='ignore'),
+    **{name: (Optional[field.annotation], None) for name, field in AutomationSettings.model_fields.items()}
+)
+
+
+def _write_json(file_path: Path, config: Any):
+    """
+    Write a config as indented JSON, stringifying values JSON cannot represent.
+    
+    The data goes to a sibling temp file that then replaces the target, so readers
+    (including the mtime-based reload) never see a partially written file.
+    """
+    if HAS_ORJSON:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        data = json.dumps(config, indent=2, default=str).encode()
+    
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 
 class ConfigurationError(Exception):
     """Configuration-related errors"""
@@ -42,6 +204,14 @@ class ConfigManager:
         self._config_cache: Dict[str, Any] = {}
         self._file_timestamps: Dict[str, float] = {}
         
+        # Merged configs by (scraper, profile, overrides); valid for one config epoch
+        self._merged_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._config_epoch = 0
+        
+        # File name -> mtime from the last directory scan, shared by burst lookups
+        self._scanned_mtimes: Dict[str, float] = {}
+        self._scanned_at = float('-inf')
+        
         # Load initial configurations
         self._load_configurations()
         
@@ -56,14 +226,24 @@ class ConfigManager:
         except Exception as e:
             logger.warning(f"Error loading configurations: {str(e)}")
     
+    @cached_property
+    def _automation_base(self) -> Dict[str, Any]:
+        """Automation settings as a plain dict; settings are fixed for the process lifetime"""
+        return settings.automation.model_dump()
+    
+    def _set_config(self, config_type: str, config: Dict[str, Any]):
+        """Replace a cached configuration, invalidating merged configs built from it"""
+        self._config_cache[config_type] = config
+        self._config_epoch += 1
+        self._merged_cache.clear()
+    
     def _load_automation_config(self):
         """Load automation-specific configuration"""
         if self.automation_config_file.exists():
             try:
-                with open(self.automation_config_file, 'r') as f:
-                    automation_config = json.load(f)
+                automation_config = _read_json(self.automation_config_file)
                 
-                self._config_cache['automation'] = automation_config
+                self._set_config('automation', automation_config)
                 self._file_timestamps['automation'] = self.automation_config_file.stat().st_mtime
                 
                 logger.info("Loaded automation configuration")
@@ -75,86 +255,18 @@ class ConfigManager:
     
     def _create_default_automation_config(self):
         """Create default automation configuration file"""
-        default_config = {
-            "scrapers": {
-                "ungm": {
-                    "enabled": True,
-                    "max_pages": 10,
-                    "request_delay": 2,
-                    "timeout": 30,
-                    "retry_attempts": 3,
-                    "priority_keywords": [
-                        "consulting", "conseil", "advisory", "technical assistance",
-                        "capacity building", "training", "formation", "étude"
-                    ],
-                    "target_countries": [
-                        # North Africa
-                        "Tunisia", "Morocco", "Algeria", "Egypt", "Libya", "Sudan",
-                        
-                        # West Africa  
-                        "Nigeria", "Ghana", "Senegal", "Mali", "Burkina Faso", "Niger",
-                        "Guinea", "Sierra Leone", "Liberia", "Ivory Coast", "Benin", "Togo",
-                        
-                        # East Africa
-                        "Kenya", "Ethiopia", "Tanzania", "Uganda", "Rwanda", "Burundi",
-                        "Somalia", "Madagascar", "Mauritius",
-                        
-                        # Central Africa
-                        "Democratic Republic of Congo", "Congo", "Cameroon", "Chad", "Gabon",
-                        "Central African Republic",
-                        
-                        # Southern Africa
-                        "South Africa", "Botswana", "Namibia", "Zimbabwe", "Zambia",
-                        "Angola", "Mozambique", "Malawi", "Lesotho"
-                    ]
-                },
-                "tunipages": {
-                    "enabled": True,
-                    "max_pages": 10,
-                    "request_delay": 2,
-                    "timeout": 30,
-                    "retry_attempts": 3,
-                    "priority_keywords": [
-                        "consulting", "conseil", "management", "étude",
-                        "formation", "expertise", "audit", "strategy"
-                    ],
-                    "focus_regions": ["Africa", "African Continent", "Sub-Saharan Africa", "North Africa"]
-                }
-            },
-            "task_manager": {
-                "max_workers": 4,
-                "scheduler_interval": 30,
-                "cleanup_interval": 3600,
-                "max_retry_attempts": 3,
-                "retry_delay": 300,
-                "task_timeout": 3600
-            },
-            "performance": {
-                "max_concurrent_scrapers": 2,
-                "memory_threshold_mb": 1024,
-                "cpu_threshold_percent": 80,
-                "disk_threshold_percent": 85
-            },
-            "monitoring": {
-                "enable_metrics": True,
-                "metrics_retention_days": 30,
-                "alert_failure_threshold": 0.5,
-                "health_check_interval": 60
-            }
-        }
-        
+        default_config = copy.deepcopy(_DEFAULT_AUTOMATION_CONFIG)
         self._save_config_file(self.automation_config_file, default_config)
-        self._config_cache['automation'] = default_config
+        self._set_config('automation', default_config)
         logger.info("Created default automation configuration")
     
     def _load_profiles_config(self):
         """Load scraping profiles configuration"""
         if self.profiles_config_file.exists():
             try:
-                with open(self.profiles_config_file, 'r') as f:
-                    profiles_config = json.load(f)
+                profiles_config = _read_json(self.profiles_config_file)
                 
-                self._config_cache['profiles'] = profiles_config
+                self._set_config('profiles', profiles_config)
                 self._file_timestamps['profiles'] = self.profiles_config_file.stat().st_mtime
                 
                 logger.info("Loaded profiles configuration")
@@ -165,72 +277,30 @@ class ConfigManager:
     
     def _create_default_profiles_config(self):
         """Create default profiles configuration"""
-        default_profiles = {
-            "topaza_africa": {
-                "name": "Topaza Africa Focus", 
-                "description": "Optimized for Topaza.net business across Africa",
-                "settings": {
-                    "max_pages": 20,
-                    "priority_countries": [
-                        "Nigeria", "South Africa", "Kenya", "Ghana", "Egypt", 
-                        "Morocco", "Tunisia", "Algeria", "Ethiopia", "Tanzania"
-                    ],
-                    "priority_sectors": [
-                        "management consulting", "business development",
-                        "training", "technical studies", "digital transformation"
-                    ],
-                    "min_relevance_score": 30.0,
-                    "urgent_deadline_days": 10
-                }
-            },
-            "development": {
-                "name": "Development Profile",
-                "description": "Fast testing with limited scope",
-                "settings": {
-                    "max_pages": 2,
-                    "headless": False,
-                    "request_delay": 1,
-                    "timeout": 15
-                }
-            },
-            "production": {
-                "name": "Production Profile",
-                "description": "Full-scale production scraping",
-                "settings": {
-                    "max_pages": 50,
-                    "headless": True,
-                    "request_delay": 3,
-                    "timeout": 60,
-                    "enable_monitoring": True
-                }
-            }
-        }
-        
+        default_profiles = copy.deepcopy(_DEFAULT_PROFILES)
         self._save_config_file(self.profiles_config_file, default_profiles)
-        self._config_cache['profiles'] = default_profiles
+        self._set_config('profiles', default_profiles)
         logger.info("Created default profiles configuration")
     
     def _load_overrides_config(self):
         """Load configuration overrides"""
         if self.overrides_config_file.exists():
             try:
-                with open(self.overrides_config_file, 'r') as f:
-                    overrides_config = json.load(f)
+                overrides_config = _read_json(self.overrides_config_file)
                 
-                self._config_cache['overrides'] = overrides_config
+                self._set_config('overrides', overrides_config)
                 self._file_timestamps['overrides'] = self.overrides_config_file.stat().st_mtime
                 
                 logger.info("Loaded overrides configuration")
             except Exception as e:
                 logger.error(f"Failed to load overrides config: {str(e)}")
         else:
-            self._config_cache['overrides'] = {}
+            self._set_config('overrides', {})
     
     def _save_config_file(self, file_path: Path, config: Dict[str, Any]):
         """Save configuration to file"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(config, f, indent=2, default=str)
+            _write_json(file_path, config)
             
             # Update timestamp
             config_type = file_path.stem
@@ -269,33 +339,50 @@ class ConfigManager:
         overrides: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Get merged configuration from multiple sources"""
+        self._refresh_config_if_needed('automation')
+        self._refresh_config_if_needed('profiles')
         
-        # Start with base automation settings
-        config = dict(settings.automation.__dict__)
-        
-        # Apply automation config file settings
-        automation_config = self.get_automation_config(scraper)
-        config.update(automation_config)
+        try:
+            overrides_key = json.dumps(overrides, sort_keys=True) if overrides else None
+        except (TypeError, ValueError):
+            # Overrides that are not plain JSON data are merged without caching
+            return self._build_merged_config(scraper, profile, overrides)
+        
+        key = (scraper, profile, overrides_key)
+        cached = self._merged_cache.get(key)
+        if cached is None:
+            epoch = self._config_epoch
+            cached = self._build_merged_config(scraper, profile, overrides)
+            # A reload while merging would leave the result stale
+            if epoch == self._config_epoch:
+                self._merged_cache[key] = cached
+        
+        # Callers may modify the result, so each gets its own top-level copy
+        return dict(cached)
+    
+    def _build_merged_config(
+        self,
+        scraper: str,
+        profile: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Merge base settings, file config, profile and overrides, later sources winning"""
         
-        # Apply profile settings if specified
+        profile_settings = {}
         if profile:
             try:
-                profile_config = self.get_profile_config(profile)
-                profile_settings = profile_config.get('settings', {})
-                config.update(profile_settings)
+                profile_settings = self.get_profile_config(profile).get('settings', {})
             except ConfigurationError as e:
                 logger.warning(f"Profile error: {str(e)}")
         
-        # Apply global overrides
-        overrides_config = self._config_cache.get('overrides', {})
-        if overrides_config:
-            config.update(overrides_config)
-        
-        # Apply local overrides
-        if overrides:
-            config.update(overrides)
-        
-        return config
+        # Base settings, then the automation file, the profile, global and local overrides
+        return {
+            **self._automation_base,
+            **self.get_automation_config(scraper),
+            **profile_settings,
+            **self._config_cache.get('overrides', {}),
+            **(overrides or {}),
+        }
     
     def update_automation_config(self, scraper: str, config: Dict[str, Any]):
         """Update automation configuration for a scraper"""
@@ -305,7 +392,7 @@ class ConfigManager:
             automation_config['scrapers'] = {}
         
         automation_config['scrapers'][scraper] = config
-        self._config_cache['automation'] = automation_config
+        self._set_config('automation', automation_config)
         
         # Save to file
         self._save_config_file(self.automation_config_file, automation_config)
@@ -323,7 +410,7 @@ class ConfigManager:
             'created_at': datetime.now().isoformat()
         }
         
-        self._config_cache['profiles'] = profiles
+        self._set_config('profiles', profiles)
         self._save_config_file(self.profiles_config_file, profiles)
         
         logger.info(f"Created new profile: {name}")
@@ -336,14 +423,14 @@ class ConfigManager:
             raise ConfigurationError(f"Profile '{name}' not found")
         
         del profiles[name]
-        self._config_cache['profiles'] = profiles
+        self._set_config('profiles', profiles)
         self._save_config_file(self.profiles_config_file, profiles)
         
         logger.info(f"Deleted profile: {name}")
     
     def set_overrides(self, overrides: Dict[str, Any]):
         """Set global configuration overrides"""
-        self._config_cache['overrides'] = overrides
+        self._set_config('overrides', overrides)
         self._save_config_file(self.overrides_config_file, overrides)
         
         logger.info("Updated global configuration overrides")
@@ -351,8 +438,7 @@ class ConfigManager:
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate configuration against schema"""
         try:
-            # Try to create AutomationSettings with the config
-            AutomationSettings(**config)
+            _PartialAutomationSettings.model_validate(config)
             return True
         except ValidationError as e:
             logger.error(f"Configuration validation failed: {str(e)}")
@@ -367,10 +453,13 @@ class ConfigManager:
         }
         
         config_file = file_map.get(config_type)
-        if not config_file or not config_file.exists():
+        if not config_file:
+            return
+        
+        current_mtime = self._scan_mtimes().get(config_file.name)
+        if current_mtime is None:
             return
         
-        current_mtime = config_file.stat().st_mtime
         cached_mtime = self._file_timestamps.get(config_type, 0)
         
         if current_mtime > cached_mtime:
@@ -383,6 +472,22 @@ class ConfigManager:
             elif config_type == 'overrides':
                 self._load_overrides_config()
     
+    def _scan_mtimes(self) -> Dict[str, float]:
+        """Modification times of the files in the config directory, rescanned at most once per interval"""
+        now = time.monotonic()
+        if now - self._scanned_at >= MTIME_SCAN_INTERVAL:
+            try:
+                with os.scandir(self.config_dir) as entries:
+                    self._scanned_mtimes = {
+                        entry.name: entry.stat().st_mtime for entry in entries if entry.is_file()
+                    }
+            except OSError as e:
+                logger.warning(f"Failed to scan config directory: {str(e)}")
+                self._scanned_mtimes = {}
+            self._scanned_at = now
+        
+        return self._scanned_mtimes
+    
     def get_all_profiles(self) -> Dict[str, Any]:
         """Get all available profiles"""
         self._refresh_config_if_needed('profiles')
@@ -398,8 +503,7 @@ class ConfigManager:
                 'exported_at': datetime.now().isoformat()
             }
             
-            with open(output_file, 'w') as f:
-                json.dump(all_config, f, indent=2, default=str)
+            _write_json(output_file, all_config)
             
             logger.info(f"Exported configuration to {output_file}")
             
@@ -410,20 +514,19 @@ class ConfigManager:
     def import_config(self, input_file: Path):
         """Import configurations from file"""
         try:
-            with open(input_file, 'r') as f:
-                imported_config = json.load(f)
+            imported_config = _read_json(input_file)
             
             # Update each configuration type
             if 'automation' in imported_config:
-                self._config_cache['automation'] = imported_config['automation']
+                self._set_config('automation', imported_config['automation'])
                 self._save_config_file(self.automation_config_file, imported_config['automation'])
             
             if 'profiles' in imported_config:
-                self._config_cache['profiles'] = imported_config['profiles']
+                self._set_config('profiles', imported_config['profiles'])
                 self._save_config_file(self.profiles_config_file, imported_config['profiles'])
             
             if 'overrides' in imported_config:
-                self._config_cache['overrides'] = imported_config['overrides']
+                self._set_config('overrides', imported_config['overrides'])
                 self._save_config_file(self.overrides_config_file, imported_config['overrides'])
             
             logger.info(f"Imported configuration from {input_file}")
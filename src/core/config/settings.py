@@ -2,15 +2,19 @@
 VisionSeal Configuration Management
 Centralized, validated configuration with environment support
 """
+from functools import cached_property
 from typing import List, Optional
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings
 from pathlib import Path
 import os
 
-# Ensure .env file is loaded
+# Ensure .env file is loaded. It is read once here into os.environ rather than by each
+# settings class: first the nearest .env above this package, then one in the working
+# directory. Neither overrides variables that are already set.
 from dotenv import load_dotenv
 load_dotenv()
+load_dotenv(".env")
 
 
 class DatabaseSettings(BaseSettings):
@@ -116,13 +120,16 @@ class AutomationSettings(BaseSettings):
     alert_failure_threshold: float = Field(0.5, env="AUTOMATION_ALERT_FAILURE_THRESHOLD")  # 50%
     
     # Session settings
-    session_persistence_enabled: bool = Field(True, env="AUTOMATION_SESSION_PERSISTENCE")
+    # Opt-in: enabling it writes a SQLite archive of finished sessions under data_dir.
+    # pydantic-settings ignores env=, so the variable is bound through the validation alias.
+    session_persistence_enabled: bool = Field(
+        False,
+        validation_alias=AliasChoices("AUTOMATION_SESSION_PERSISTENCE", "SESSION_PERSISTENCE_ENABLED")
+    )
     session_retry_on_startup: bool = Field(True, env="AUTOMATION_SESSION_RETRY_ON_STARTUP")
     
     class Config:
         env_prefix = ""  # No prefix to read UNGM_USERNAME directly
-        env_file = ".env"
-        env_file_encoding = "utf-8"
         extra = "ignore"  # Ignore extra fields
 
 
@@ -132,6 +139,8 @@ class SecuritySettings(BaseSettings):
     allowed_origins: List[str] = Field(["http://localhost:3000"], env="ALLOWED_ORIGINS")
     max_file_size: int = Field(10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB
     allowed_file_types: List[str] = Field([".pdf", ".docx", ".pptx"], env="ALLOWED_FILE_TYPES")
+    # Cost factor for locally hashed passwords; tune so a hash stays under ~300ms on the host
+    bcrypt_rounds: int = Field(12, ge=4, le=31, env="BCRYPT_ROUNDS")
     
     @field_validator("allowed_origins", mode="before")
     @classmethod
@@ -170,16 +179,6 @@ class Settings(BaseSettings):
     project_name: str = "VisionSeal Complete"
     version: str = "2.0.0"
     
-    # Sub-configurations (initialized in __init__)
-    database: Optional[DatabaseSettings] = None
-    redis: Optional[RedisSettings] = None
-    openai: Optional[OpenAISettings] = None
-    weaviate: Optional[WeaviateSettings] = None
-    ai: Optional[AISettings] = None
-    automation: Optional[AutomationSettings] = None
-    security: Optional[SecuritySettings] = None
-    api: Optional[APISettings] = None
-    
     # Paths
     base_dir: Path = Field(default_factory=lambda: Path(__file__).parent.parent.parent.parent)
     data_dir: Path = Field(default_factory=lambda: Path("data"))
@@ -189,63 +188,67 @@ class Settings(BaseSettings):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        # Initialize sub-configurations with proper error handling
+        # Create directories
+        self.create_directories()
+    
+    # Sub-configurations are built on first access, so each process only pays for
+    # reading and validating the sections it actually uses
+    
+    @cached_property
+    def database(self) -> DatabaseSettings:
         try:
-            self.database = DatabaseSettings()
+            return DatabaseSettings()
         except Exception:
             # Fallback for demo
-            self.database = DatabaseSettings(url="sqlite:///./visionseal_demo.db")
-        
+            return DatabaseSettings(url="sqlite:///./visionseal_demo.db")
+    
+    @cached_property
+    def redis(self) -> RedisSettings:
+        return RedisSettings()
+    
+    @cached_property
+    def openai(self) -> OpenAISettings:
         try:
-            self.redis = RedisSettings()
+            return OpenAISettings()
         except Exception:
-            self.redis = RedisSettings()
-        
-        try:
-            self.openai = OpenAISettings()
-        except Exception as e:
             # Only use fallback if API key is truly not available
-            import os
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
-                self.openai = OpenAISettings(api_key=api_key)
-            else:
-                self.openai = OpenAISettings(api_key="demo-key-replace-with-real-key")
-        
-        try:
-            self.weaviate = WeaviateSettings()
-        except Exception:
-            self.weaviate = WeaviateSettings()
-        
-        try:
-            self.ai = AISettings()
-        except Exception:
-            self.ai = AISettings()
-        
+                return OpenAISettings(api_key=api_key)
+            return OpenAISettings(api_key="demo-key-replace-with-real-key")
+    
+    @cached_property
+    def weaviate(self) -> WeaviateSettings:
+        return WeaviateSettings()
+    
+    @cached_property
+    def ai(self) -> AISettings:
+        return AISettings()
+    
+    @cached_property
+    def automation(self) -> AutomationSettings:
         try:
-            self.automation = AutomationSettings()
+            return AutomationSettings()
         except Exception:
             # Fallback for demo
-            self.automation = AutomationSettings(
+            return AutomationSettings(
                 ungm_username="demo-username",
                 ungm_password="demo-password",
                 tunipages_username="demo-username",
                 tunipages_password="demo-password"
             )
-        
+    
+    @cached_property
+    def security(self) -> SecuritySettings:
         try:
-            self.security = SecuritySettings()
+            return SecuritySettings()
         except Exception:
             # Fallback for demo
-            self.security = SecuritySettings(secret_key="demo-secret-key-for-testing-only")
-        
-        try:
-            self.api = APISettings()
-        except Exception:
-            self.api = APISettings()
-        
-        # Create directories
-        self.create_directories()
+            return SecuritySettings(secret_key="demo-secret-key-for-testing-only")
+    
+    @cached_property
+    def api(self) -> APISettings:
+        return APISettings()
     
     def create_directories(self):
         """Create necessary directories"""
@@ -275,8 +278,6 @@ class Settings(BaseSettings):
         return datetime.now().isoformat()
     
     class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
         case_sensitive = False
         extra = "ignore"  # Ignore extra fields from environment
         arbitrary_types_allowed = True  # Allow complex types
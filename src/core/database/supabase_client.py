@@ -7,7 +7,10 @@ import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
 from postgrest.exceptions import APIError
+import importlib.util
+import httpx
 import logging
 from dotenv import load_dotenv
 import asyncio
@@ -19,6 +22,11 @@ from core.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package; without it the pool speaks HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+HTTP_TIMEOUT = 120  # seconds, the Supabase client's own PostgREST default
+
 class SupabaseManager:
     """Manages Supabase database operations"""
     
@@ -30,16 +38,28 @@ class SupabaseManager:
         if not self.url or not self.key:
             raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment")
         
+        # One connection pool shared by both clients; auth headers are sent per request
+        self.http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            limits=HTTP_POOL_LIMITS,
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True
+        )
+        
         # Create clients
-        self.client: Client = create_client(self.url, self.key)
+        self.client: Client = create_client(self.url, self.key, options=self._client_options())
         
         # Service client for automation (bypasses RLS)
         if self.service_key:
-            self.service_client: Client = create_client(self.url, self.service_key)
+            self.service_client: Client = create_client(self.url, self.service_key, options=self._client_options())
         else:
             logger.warning("SUPABASE_SERVICE_KEY not set - automation may have limited access")
             self.service_client = self.client
     
+    def _client_options(self) -> SyncClientOptions:
+        """Options for a new client; each client keeps its own auth session storage"""
+        return SyncClientOptions(httpx_client=self.http_client)
+    
     def get_client(self, use_service_key: bool = False) -> Client:
         """Get appropriate Supabase client"""
         return self.service_client if use_service_key else self.client
@@ -16,7 +16,11 @@ class AuthManager:
     """Handles authentication and authorization"""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=settings.security.bcrypt_rounds
+        )
         self.security = HTTPBearer(auto_error=False)
     
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
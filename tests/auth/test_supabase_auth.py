@@ -1,6 +1,8 @@
 """
 Tests for Supabase authentication
 """
+import hashlib
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi import HTTPException
@@ -138,13 +140,19 @@ class TestSupabaseAuthManager:
     async def test_logout_user_success(self, auth_manager, mock_supabase_client):
         """Test successful user logout"""
         # Mock successful logout
-        mock_supabase_client.auth.set_session.return_value = None
-        mock_supabase_client.auth.sign_out.return_value = Mock()
+        mock_supabase_client.auth.admin.sign_out.return_value = None
+        
+        token = "valid-token-1234567890"
+        token_hash = hashlib.sha256(token.encode()).digest()
+        auth_manager._token_cache.set(token_hash[:16], (token_hash, {"user_id": "user-123"}))
         
-        result = await auth_manager.logout_user("valid-token")
+        result = await auth_manager.logout_user(token)
         
         assert result["success"] is True
         assert "successfully" in result["message"]
+        assert auth_manager._token_cache.get(token_hash[:16]) is None
+        mock_supabase_client.auth.admin.sign_out.assert_called_once_with(token)
+        mock_supabase_client.auth.set_session.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_logout_user_invalid_token(self, auth_manager, mock_supabase_client):
@@ -159,7 +167,7 @@ class TestSupabaseAuthManager:
     async def test_logout_user_exception(self, auth_manager, mock_supabase_client):
         """Test logout with exception"""
         # Mock exception during logout
-        mock_supabase_client.auth.sign_out.side_effect = Exception("Logout failed")
+        mock_supabase_client.auth.admin.sign_out.side_effect = Exception("Logout failed")
         
         # Should still return success (graceful degradation)
         result = await auth_manager.logout_user("valid-token-123")
@@ -250,7 +258,7 @@ class TestSupabaseAuthManager:
         
         assert result["user_id"] == "user-123"
         assert result["email"] == "test@example.com"
-        assert result["email_verified"] is True
+        assert result["user_metadata"] == {"first_name": "Test"}
         assert result["is_active"] is True
 
     @pytest.mark.asyncio
@@ -387,22 +395,27 @@ class TestSupabaseAuthManager:
         mock_user = Mock()
         mock_user.email = "test@example.com"
         
-        mock_supabase_client.auth.set_session.return_value = None
-        mock_supabase_client.auth.update_user.return_value = Mock(user=mock_user)
+        user_auth_client = Mock()
+        user_auth_client.update_user.return_value = Mock(user=mock_user)
         
-        result = await auth_manager.update_password("valid-token", "NewPassword123!")
+        with patch.object(auth_manager, '_user_auth_client', return_value=user_auth_client):
+            result = await auth_manager.update_password("valid-token", "NewPassword123!")
         
         assert result["success"] is True
         assert "successfully" in result["message"]
+        user_auth_client.set_session.assert_called_once_with("valid-token", refresh_token="")
+        # The shared client's session is never touched
+        mock_supabase_client.auth.set_session.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_update_password_failure(self, auth_manager, mock_supabase_client):
         """Test password update failure"""
         # Mock failed password update
-        mock_supabase_client.auth.set_session.return_value = None
-        mock_supabase_client.auth.update_user.return_value = Mock(user=None)
+        user_auth_client = Mock()
+        user_auth_client.update_user.return_value = Mock(user=None)
         
-        result = await auth_manager.update_password("valid-token", "NewPassword123!")
+        with patch.object(auth_manager, '_user_auth_client', return_value=user_auth_client):
+            result = await auth_manager.update_password("valid-token", "NewPassword123!")
         
         assert result["success"] is False
         assert "error" in result
\ No newline at end of file
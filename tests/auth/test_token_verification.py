@@ -0,0 +1,208 @@
+"""
+Tests for token verification caching and local JWKS verification
+"""
+import asyncio
+import hashlib
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from unittest.mock import Mock, AsyncMock, patch
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from api.routers.auth import get_current_user_profile
+
+from core.auth.supabase_auth import SupabaseAuthManager, TOKEN_CACHE_TTL
+
+
+def make_token(algorithm="HS256", key="test-secret-key-at-least-32-bytes", expires_in=3600, kid=None):
+    """Build a Supabase-style access token for user-123"""
+    claims = {
+        "sub": "user-123",
+        "email": "test@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + expires_in,
+        "user_metadata": {"email_verified": True},
+    }
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+
+class TestTokenVerification:
+    """Test token verification and its caches"""
+
+    @pytest.fixture
+    def auth_manager(self, mock_supabase_client):
+        """Create auth manager with mocked Supabase client and JWKS client"""
+        with patch('core.auth.supabase_auth.supabase_manager') as mock_manager:
+            mock_manager.get_client.return_value = mock_supabase_client
+            manager = SupabaseAuthManager()
+
+        manager._jwks_client = Mock()
+        manager._shared_cache = None
+
+        # Remote verification and profile lookups succeed unless a test says otherwise
+        mock_user = Mock(id="user-123", email="test@example.com", user_metadata={})
+        mock_supabase_client.auth.get_user.return_value = Mock(user=mock_user)
+        mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(
+            data=[{"id": "user-123", "status": "active"}]
+        )
+        return manager
+
+    @pytest.fixture
+    def rsa_key(self):
+        """RSA signing key standing in for the project's JWKS key"""
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_get_user(self, auth_manager, mock_supabase_client):
+        """Test a cached verification is reused without asking Supabase again"""
+        token = make_token()
+
+        first = await auth_manager.authenticate(token)
+        second = await auth_manager.authenticate(token)
+
+        assert first["user_id"] == second["user_id"] == "user-123"
+        mock_supabase_client.auth.get_user.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_cache_ttl_clamped_to_token_expiry(self, auth_manager):
+        """Test a token expiring soon is cached only until its exp claim"""
+        token = make_token(expires_in=5)
+        key = hashlib.sha256(token.encode()).digest()[:16]
+
+        await auth_manager.authenticate(token)
+
+        expires_at, _ = auth_manager._token_cache._data[key]
+        assert expires_at - time.monotonic() <= 5
+        assert 5 < TOKEN_CACHE_TTL
+
+    @pytest.mark.asyncio
+    async def test_expired_token_not_cached(self, auth_manager, mock_supabase_client):
+        """Test a token past its exp claim is never cached"""
+        token = make_token(expires_in=-60)
+
+        await auth_manager.authenticate(token)
+        await auth_manager.authenticate(token)
+
+        assert mock_supabase_client.auth.get_user.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rs256_token_verified_locally(self, auth_manager, mock_supabase_client, rsa_key):
+        """Test an RS256 token is verified against the JWKS without calling Supabase"""
+        auth_manager._jwks_client.get_signing_key_from_jwt.return_value = Mock(key=rsa_key.public_key())
+        token = make_token(algorithm="RS256", key=rsa_key, kid="current-key")
+
+        result = await auth_manager.authenticate(token)
+
+        assert result["user_id"] == "user-123"
+        assert result["email"] == "test@example.com"
+        assert result["user_metadata"] == {"email_verified": True}
+        auth_manager._jwks_client.get_signing_key_from_jwt.assert_called_once_with(token)
+        mock_supabase_client.auth.get_user.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rs256_token_with_bad_signature_rejected(self, auth_manager, mock_supabase_client, rsa_key):
+        """Test a token signed with another key is rejected without a remote fallback"""
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        auth_manager._jwks_client.get_signing_key_from_jwt.return_value = Mock(key=rsa_key.public_key())
+        token = make_token(algorithm="RS256", key=other_key, kid="current-key")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_manager.authenticate(token)
+
+        assert exc_info.value.status_code == 401
+        mock_supabase_client.auth.get_user.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_falls_back_to_supabase(self, auth_manager, mock_supabase_client, rsa_key):
+        """Test a token whose key id is not in the JWKS is verified remotely"""
+        auth_manager._jwks_client.get_signing_key_from_jwt.side_effect = jwt.PyJWKClientError(
+            "Unable to find a signing key that matches: 'rotated-key'"
+        )
+        token = make_token(algorithm="RS256", key=rsa_key, kid="rotated-key")
+
+        result = await auth_manager.authenticate(token)
+
+        assert result["user_id"] == "user-123"
+        mock_supabase_client.auth.get_user.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_hs256_token_falls_back_to_supabase(self, auth_manager, mock_supabase_client):
+        """Test a symmetric token skips the JWKS and is verified remotely"""
+        token = make_token()
+
+        result = await auth_manager.authenticate(token)
+
+        assert result["user_id"] == "user-123"
+        auth_manager._jwks_client.get_signing_key_from_jwt.assert_not_called()
+        mock_supabase_client.auth.get_user.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_failed_verification_not_cached(self, auth_manager, mock_supabase_client):
+        """Test a rejected token is checked again on the next request"""
+        token = make_token()
+        mock_supabase_client.auth.get_user.return_value = Mock(user=None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_manager.authenticate(token)
+
+        assert exc_info.value.status_code == 401
+        assert auth_manager._token_cache.get(hashlib.sha256(token.encode()).digest()[:16]) is None
+
+        # Supabase accepting the token later is not masked by the earlier failure
+        mock_supabase_client.auth.get_user.return_value = Mock(user=Mock(id="user-123", email="test@example.com"))
+        result = await auth_manager.authenticate(token)
+
+        assert result["user_id"] == "user-123"
+        assert mock_supabase_client.auth.get_user.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_me_response_same_for_local_and_remote_verification(self, auth_manager, mock_supabase_client, rsa_key):
+        """Test /auth/me returns the same user data whichever way the token was verified"""
+        mock_supabase_client.auth.get_user.return_value = Mock(user=Mock(
+            id="user-123",
+            email="test@example.com",
+            user_metadata={"email_verified": True},
+            email_confirmed_at="2024-01-01T00:00:00Z",
+            created_at="2024-01-01T00:00:00Z",
+            last_sign_in_at="2024-06-01T00:00:00Z"
+        ))
+        auth_manager._jwks_client.get_signing_key_from_jwt.return_value = Mock(key=rsa_key.public_key())
+        local_token = make_token(algorithm="RS256", key=rsa_key, kid="current-key")
+        remote_token = make_token()
+
+        users = []
+        responses = []
+        with patch('api.routers.auth.get_auth_manager', return_value=auth_manager):
+            for token in (local_token, remote_token):
+                current_user = await auth_manager.authenticate(token)
+                users.append(current_user)
+                credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+                response = await get_current_user_profile(current_user, credentials)
+                responses.append(response.data)
+
+        assert users[0] == users[1]
+        assert responses[0] == responses[1]
+        assert responses[0]["email_verified"] is True
+        assert responses[0]["created_at"] == "2024-01-01T00:00:00Z"
+        assert responses[0]["last_sign_in"] == "2024-06-01T00:00:00Z"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_profile_lookups_share_one_fetch(self, auth_manager):
+        """Test concurrent requests for the same profile wait on a single lookup"""
+        profile = {"id": "user-123", "status": "active"}
+
+        async def slow_fetch(user_id):
+            await asyncio.sleep(0.05)
+            return profile
+
+        auth_manager._fetch_user_profile = AsyncMock(side_effect=slow_fetch)
+
+        results = await asyncio.gather(*(auth_manager._get_user_profile("user-123") for _ in range(5)))
+
+        assert results == [profile] * 5
+        auth_manager._fetch_user_profile.assert_awaited_once_with("user-123")
+        assert auth_manager._profile_inflight == {}
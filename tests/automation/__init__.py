@@ -0,0 +1 @@
+# Automation tests package
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Tests for the background task manager
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import wait
+from datetime import timedelta
+
+import pytest
+from unittest.mock import patch
+
+from automation.task_manager import TaskManager, TaskPriority, TaskStatus
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll until predicate() is true, failing the test on timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for task manager state")
+        time.sleep(0.01)
+
+
+class TestTaskManager:
+    """Test task scheduling, cancellation, retries and cleanup"""
+
+    @pytest.fixture
+    def manager(self):
+        """Task manager with a single worker, so queued tasks wait their turn"""
+        manager = TaskManager(max_workers=1)
+        yield manager
+        manager.shutdown()
+
+    @pytest.fixture
+    def busy_worker(self, manager):
+        """Occupy the only worker until the returned event is set"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        manager.submit_task(manager.create_task("blocker", block))
+        assert started.wait(5)
+        yield release
+        release.set()
+
+    def test_queued_tasks_run_in_priority_order(self, manager, busy_worker):
+        """Test the most urgent queued task runs first"""
+        order = []
+        task_ids = [
+            manager.create_task(priority.name, order.append, args=(priority.name,), priority=priority)
+            for priority in (TaskPriority.LOW, TaskPriority.MEDIUM, TaskPriority.URGENT, TaskPriority.HIGH)
+        ]
+        for task_id in task_ids:
+            assert manager.submit_task(task_id)
+        futures = [manager.running_tasks[task_id] for task_id in task_ids]
+
+        busy_worker.set()
+        wait(futures, timeout=5)
+
+        assert order == ["URGENT", "HIGH", "MEDIUM", "LOW"]
+
+    def test_cancel_queued_task(self, manager, busy_worker):
+        """Test a task cancelled while queued never runs"""
+        calls = []
+        task_id = manager.create_task("queued", calls.append, args=("ran",))
+        manager.submit_task(task_id)
+
+        assert manager.cancel_task(task_id) is True
+        assert manager.get_task_status(task_id) == TaskStatus.CANCELLED
+
+        # A later task proves the worker has moved past the cancelled one
+        after_id = manager.create_task("after", lambda: None)
+        manager.submit_task(after_id)
+        busy_worker.set()
+        wait_until(lambda: manager.get_task_status(after_id) == TaskStatus.COMPLETED)
+
+        assert calls == []
+        assert manager.get_task_status(task_id) == TaskStatus.CANCELLED
+
+    def test_cancel_running_coroutine_task(self, manager):
+        """Test a running coroutine task is stopped and stays cancelled"""
+        started = threading.Event()
+
+        async def long_scrape():
+            started.set()
+            await asyncio.sleep(10)
+
+        task_id = manager.create_task("scrape", long_scrape)
+        manager.submit_task(task_id)
+        assert started.wait(5)
+
+        assert manager.cancel_task(task_id) is True
+        wait_until(lambda: task_id not in manager.running_tasks)
+
+        assert manager.get_task_status(task_id) == TaskStatus.CANCELLED
+        assert manager.get_task_result(task_id) is None
+        assert manager.get_metrics()["tasks_completed"] == 0
+
+    def test_cancel_running_thread_pool_task_refused(self, manager, busy_worker):
+        """Test a plain callable already running on the thread pool cannot be cancelled"""
+        blocker_id = next(iter(manager.running_tasks))
+
+        assert manager.cancel_task(blocker_id) is False
+        assert manager.get_task_status(blocker_id) == TaskStatus.RUNNING
+
+        busy_worker.set()
+        wait_until(lambda: manager.get_task_status(blocker_id) == TaskStatus.COMPLETED)
+
+    def test_failed_task_retried_after_delay(self, manager):
+        """Test a failed task is requeued by the scheduler once its retry delay passes"""
+        attempts = []
+
+        def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise ValueError("temporary failure")
+            return "ok"
+
+        task_id = manager.create_task("flaky", flaky, max_retries=1, retry_delay=1)
+        manager.submit_task(task_id)
+        wait_until(lambda: manager.get_task_status(task_id) == TaskStatus.RETRYING)
+
+        manager.start_scheduler()
+        wait_until(lambda: manager.get_task_status(task_id) == TaskStatus.COMPLETED)
+
+        assert len(attempts) == 2
+        assert attempts[1] - attempts[0] >= 1
+        assert manager.get_task_result(task_id).result == "ok"
+        assert manager.get_metrics()["tasks_retried"] == 1
+
+    def test_dependent_launched_when_dependency_completes(self, manager):
+        """Test a task waiting on another starts as soon as that task completes"""
+        order = []
+        first_id = manager.create_task("first", order.append, args=("first",))
+        second_id = manager.create_task("second", order.append, args=("second",), dependencies=[first_id])
+
+        assert manager.submit_task(second_id) is False
+
+        manager.submit_task(first_id)
+        wait_until(lambda: manager.get_task_status(second_id) == TaskStatus.COMPLETED)
+
+        assert order == ["first", "second"]
+
+    def test_expired_tasks_removed(self, manager):
+        """Test finished tasks past the retention window are removed by cleanup"""
+        finished_id = manager.create_task("finished", lambda: "done")
+        pending_id = manager.create_task("pending", lambda: None)
+        manager.submit_task(finished_id)
+        wait_until(lambda: manager.get_task_status(finished_id) == TaskStatus.COMPLETED)
+
+        with patch('automation.task_manager._TASK_RETENTION', timedelta(0)):
+            manager._cleanup_old_tasks()
+
+        assert finished_id not in manager.tasks
+        assert manager.get_task_status(finished_id) is None
+        assert manager.get_task_status(pending_id) == TaskStatus.PENDING
+        assert manager.get_metrics()["total_tasks"] == 1